@@ -0,0 +1,295 @@
+"""Where the dashboard's aggregations run.
+
+Both backends answer the same questions over an inclusive date range:
+
+* :class:`PandasBackend` loads the rides into memory once and serves the
+  charts from the precomputed indexes (KPI prefix sums, rollup cube,
+  distribution sketches, top-k summaries) and the fused engine;
+* :class:`SQLiteBackend` never loads the rows: every chart is a
+  ``GROUP BY`` pushed down to ola_rides.db, so the app's memory stays flat
+  however large the table grows.  Results go through the
+  :class:`sql_engine.QueryEngine` cache.
+
+Aggregations are declared as :class:`fused.Agg` and results have the same
+columns and order on either backend.  A result that is approximate carries
+its error bound in ``frame.attrs["error_bound"]``.
+
+:meth:`Backend.filtered` narrows a backend to the sidebar's
+``{column: values}`` filters: the pandas backend selects rows with its
+:class:`bitmaps.BitmapIndex` and aggregates just those, the SQLite backend
+adds ``IN`` predicates to every query.
+"""
+import copy
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from bitmaps import FILTER_COLUMNS
+from fused import result_column, run as run_fused, sort_order
+from kpis import row_totals, summarize
+from plots import SCATTER_POINT_BUDGET, Grid, Scatter, scatter_data
+from profiling import NO_PROFILER
+from rollup import cube_supports, run_agg
+from sketches import HISTOGRAMS
+
+BACKENDS = ["pandas", "sqlite"]
+
+
+class Backend:
+    """Filtering shared by both backends; unfiltered by default."""
+
+    filters = {}
+    profiler = NO_PROFILER
+
+    def filtered(self, filters, profiler=None):
+        """A view of this backend restricted to rows matching ``{column: values}``.
+
+        Columns with no values selected are not filtered on.  The view
+        records its row selections on ``profiler``, if given.
+        """
+        view = copy.copy(self)
+        view.filters = {column: list(values) for column, values in filters.items() if len(values)}
+        view._selection = {}
+        if profiler is not None:
+            view.profiler = profiler
+        return view
+
+
+class PandasBackend(Backend):
+    """In-memory rides with their per-day indexes."""
+
+    def __init__(self, store, kpis, dists, cube, topk=None, bitmaps=None):
+        self.store = store
+        self.kpis = kpis
+        self.dists = dists
+        self.cube = cube
+        self.topk = topk
+        self.bitmaps = bitmaps
+
+    def date_bounds(self):
+        return self.store.min_date, self.store.max_date
+
+    def filter_options(self):
+        return self.bitmaps.options()
+
+    def _rows(self, start, end):
+        """Rows in the date range matching the filters; None when unfiltered."""
+        if not self.filters:
+            return None
+        key = (start, end)
+        if key not in self._selection:
+            with self.profiler.span("filter rows", "filter"):
+                self._selection = {key: self.store.df.take(self.bitmaps.select(self.filters, start, end))}
+        return self._selection[key]
+
+    def kpi_summary(self, start, end):
+        rows = self._rows(start, end)
+        k = self.kpis.summary(start, end) if rows is None else summarize(row_totals(rows))
+        k["median_fare"] = self.dists.median_fare(start, end, rows)
+        return k
+
+    def run(self, aggs, start, end):
+        """``{name: Agg}`` -> ``{name: DataFrame}``; the cube and top-k summaries answer what they can."""
+        rows = self._rows(start, end)
+        if rows is not None:
+            # The precomputed indexes cover all rides; a filtered view scans its rows.
+            return run_fused(rows, aggs)
+        cells = self.cube.slice(start, end)
+        out = {name: run_agg(cells, agg) for name, agg in aggs.items() if cube_supports(agg)}
+        if self.topk is not None and not self.topk.exact(start, end):
+            out.update({name: self.topk.query(name, start, end) for name in aggs
+                        if name not in out and name in self.topk.aggs and self.topk.aggs[name] == aggs[name]})
+        rest = {name: agg for name, agg in aggs.items() if name not in out}
+        if rest:
+            out.update(run_fused(self.store.filter_by_dates(start, end), rest))
+        return {name: out[name] for name in aggs}
+
+    def box_stats(self, start, end):
+        return self.dists.box_stats(start, end, self._rows(start, end))
+
+    def histogram(self, column, start, end):
+        return self.dists.histogram(column, start, end, self._rows(start, end))
+
+    def scatter(self, x, y, start, end, budget=SCATTER_POINT_BUDGET, strategy="density"):
+        rows = self._rows(start, end)
+        rows = self.store.filter_by_dates(start, end) if rows is None else rows
+        return scatter_data(rows, x, y, budget, strategy)
+
+
+# -----------------------
+# SQLite
+# -----------------------
+def _q(column):
+    return '"%s"' % column
+
+
+def _day(value):
+    return pd.Timestamp(value).date()
+
+
+def _weighted_quantiles(values, counts, qs):
+    """Linear-interpolated quantiles (like ``Series.quantile``) of a value histogram."""
+    cum = np.cumsum(counts)
+    pos = np.asarray(qs) * (cum[-1] - 1)
+    lo = np.floor(pos)
+    v_lo = values[np.searchsorted(cum, lo, side="right")]
+    v_hi = values[np.minimum(np.searchsorted(cum, lo + 1, side="right"), len(values) - 1)]
+    return v_lo + (pos - lo) * (v_hi - v_lo)
+
+
+class SQLiteBackend(Backend):
+    """Aggregations pushed down to the ``rides`` table."""
+
+    def __init__(self, engine, table="rides"):
+        self.engine = engine
+        self.table = table
+
+    def _frame(self, sql, params=()):
+        return self.engine.query(sql, params).frame
+
+    def _range(self, start, end):
+        """Date and filter predicate; ``Date`` is ISO text, so this is an index range scan."""
+        stop = _day(end) + datetime.timedelta(days=1)
+        where, params = '"Date" >= ? AND "Date" < ?', [str(_day(start)), str(stop)]
+        for column, values in self.filters.items():
+            where += f" AND {_q(column)} IN ({', '.join('?' * len(values))})"
+            params += values
+        return where, params
+
+    def date_bounds(self):
+        row = self._frame(f'SELECT MIN("Date") AS lo, MAX("Date") AS hi FROM {self.table}').iloc[0]
+        return _day(row["lo"]), _day(row["hi"])
+
+    def filter_options(self):
+        return {column: self._frame(f"SELECT DISTINCT {_q(column)} AS v FROM {self.table} "
+                                    f"WHERE {_q(column)} IS NOT NULL ORDER BY 1")["v"].tolist()
+                for column in FILTER_COLUMNS}
+
+    def kpi_summary(self, start, end):
+        where, params = self._range(start, end)
+        success = "\"Booking_Status\" = 'Success'"
+        sql = f"""
+            SELECT COUNT(*) AS rides,
+                   TOTAL({success}) AS success,
+                   TOTAL(instr("Booking_Status", 'Canceled') > 0) AS cancelled,
+                   TOTAL("Booking_Status" IS NOT 'Success') AS not_success,
+                   TOTAL(CASE WHEN {success} THEN "Booking_Value" END) AS success_fare,
+                   COUNT(CASE WHEN {success} THEN "Booking_Value" END) AS success_fare_n,
+                   TOTAL(CASE WHEN {success} THEN "Ride_Distance" END) AS success_distance,
+                   COUNT(CASE WHEN {success} THEN "Ride_Distance" END) AS success_distance_n,
+                   TOTAL("Driver_Ratings") AS driver_rating_sum,
+                   COUNT("Driver_Ratings") AS driver_rating_n,
+                   TOTAL("Customer_Rating") AS customer_rating_sum,
+                   COUNT("Customer_Rating") AS customer_rating_n
+            FROM {self.table} WHERE {where}"""
+        k = summarize(self._frame(sql, params).iloc[0].astype(float).to_dict())
+        fares = self._frame(
+            f'SELECT "Booking_Value" AS v, COUNT(*) AS n FROM {self.table} '
+            f'WHERE {where} AND {success} AND "Booking_Value" IS NOT NULL GROUP BY 1 ORDER BY 1', params)
+        k["median_fare"] = (float(_weighted_quantiles(fares["v"].to_numpy(), fares["n"].to_numpy(), [0.5])[0])
+                            if len(fares) else float("nan"))
+        return k
+
+    def _agg_sql(self, agg, start, end):
+        where, params = self._range(start, end)
+        key = 'substr("Date", 1, 10)' if agg.by == "Date" else _q(agg.by)
+        clauses = [where, f"{key} IS NOT NULL"]
+        if agg.where is not None:
+            col, op, label = agg.where
+            clauses.append(f"{_q(col)} = ?" if op == "eq" else f"instr({_q(col)}, ?) > 0")
+            params.append(label)
+        stat = {"count": "COUNT(*)", "sum": f"TOTAL({_q(agg.value)})", "mean": f"AVG({_q(agg.value)})"}[agg.stat]
+        sql = f"SELECT {key} AS k, {stat} AS v FROM {self.table} WHERE {' AND '.join(clauses)} GROUP BY 1"
+        if agg.stat == "mean":
+            sql += f" HAVING COUNT({_q(agg.value)}) > 0"
+        by_value = "v DESC, k"
+        if agg.top is not None:
+            sql = f"SELECT * FROM ({sql} ORDER BY {by_value} LIMIT {int(agg.top)})"
+        return sql + " ORDER BY " + (by_value if sort_order(agg) == "value" else "k"), params
+
+    def run(self, aggs, start, end):
+        out = {}
+        for name, agg in aggs.items():
+            frame = self._frame(*self._agg_sql(agg, start, end))
+            frame = frame.rename(columns={"k": agg.by, "v": result_column(agg)})
+            if agg.by == "Date":
+                frame[agg.by] = pd.to_datetime(frame[agg.by])
+            out[name] = frame
+        return out
+
+    def box_stats(self, start, end):
+        where, params = self._range(start, end)
+        counts = self._frame(
+            f'SELECT "Vehicle_Type" AS name, "Booking_Value" AS v, COUNT(*) AS n FROM {self.table} '
+            f'WHERE {where} AND "Vehicle_Type" IS NOT NULL AND "Booking_Value" IS NOT NULL '
+            "GROUP BY 1, 2 ORDER BY 1, 2", params)
+        rows = []
+        for name, group in counts.groupby("name", sort=True):
+            values, n = group["v"].to_numpy(), group["n"].to_numpy()
+            q1, med, q3 = _weighted_quantiles(values, n, [0.25, 0.5, 0.75])
+            iqr = q3 - q1
+            lower = values[values >= q1 - 1.5 * iqr].min()
+            upper = values[values <= q3 + 1.5 * iqr].max()
+            rows.append((name, q1, med, q3, lower, upper))
+        return rows
+
+    def histogram(self, column, start, end):
+        """Counts over fixed bins spanning the whole table, as :class:`sketches.DistributionIndex` uses."""
+        bins = HISTOGRAMS[column]
+        span = self._frame(f"SELECT MIN({_q(column)}) AS lo, MAX({_q(column)}) AS hi FROM {self.table}").iloc[0]
+        lo, hi = (0.0, 1.0) if pd.isna(span["lo"]) else (float(span["lo"]), float(span["hi"]))
+        edges = np.histogram_bin_edges([lo, hi], bins=bins)
+        where, params = self._range(start, end)
+        # Count the inner edges at or below each value: the same slot as
+        # searchsorted(edges, v, "right") - 1, without float drift at the edges.
+        slot = " + ".join(f"({_q(column)} >= ?)" for _ in edges[1:-1]) or "0"
+        slots = self._frame(
+            f"SELECT {slot} AS slot, COUNT(*) AS n "
+            f"FROM {self.table} WHERE {where} AND {_q(column)} IS NOT NULL GROUP BY 1",
+            list(edges[1:-1]) + params)
+        counts = np.zeros(bins, dtype=np.int64)
+        counts[slots["slot"].to_numpy(dtype=int)] = slots["n"].to_numpy()
+        return edges, counts
+
+    def scatter(self, x, y, start, end, budget=SCATTER_POINT_BUDGET, strategy="density", bins=80, sample_bins=50):
+        """Points if they fit the budget, else a SQL-side density grid or stratified sample."""
+        where, params = self._range(start, end)
+        where += f" AND {_q(x)} IS NOT NULL AND {_q(y)} IS NOT NULL"
+        span = self._frame(
+            f"SELECT COUNT(*) AS n, MIN({_q(x)}) AS x0, MAX({_q(x)}) AS x1, MIN({_q(y)}) AS y0, MAX({_q(y)}) AS y1 "
+            f"FROM {self.table} WHERE {where}", params).iloc[0]
+        total = int(span["n"])
+        if total <= budget:
+            points = self._frame(f"SELECT {_q(x)}, {_q(y)} FROM {self.table} WHERE {where}", params)
+            return Scatter(points, None, total)
+
+        n_bins = bins if strategy == "density" else sample_bins
+        x_edges = np.histogram_bin_edges([span["x0"], span["x1"]], bins=n_bins)
+        y_edges = np.histogram_bin_edges([span["y0"], span["y1"]], bins=n_bins)
+        cell = (f"MIN(CAST(({_q(x)} - ?) / ? AS INTEGER), {n_bins - 1}) * {n_bins} + "
+                f"MIN(CAST(({_q(y)} - ?) / ? AS INTEGER), {n_bins - 1})")
+        cell_params = [x_edges[0], x_edges[1] - x_edges[0], y_edges[0], y_edges[1] - y_edges[0]]
+        if strategy == "density":
+            cells = self._frame(f"SELECT {cell} AS cell, COUNT(*) AS n FROM {self.table} WHERE {where} GROUP BY 1",
+                                cell_params + params)
+            counts = np.zeros(n_bins * n_bins)
+            counts[cells["cell"].to_numpy(dtype=int)] = cells["n"].to_numpy()
+            grid = Grid((x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2,
+                        counts.reshape(n_bins, n_bins).T)
+            return Scatter(None, grid, total)
+
+        # Per-cell quota and trim to the budget as in plots.stratified_sample; a
+        # rowid hash stands in for the random order so the sample is stable
+        # across reruns.
+        points = self._frame(f"""
+            SELECT {_q(x)}, {_q(y)} FROM (
+                SELECT {_q(x)}, {_q(y)}, h,
+                       ROW_NUMBER() OVER (PARTITION BY cell ORDER BY h) AS r,
+                       MAX(ROUND(COUNT(*) OVER (PARTITION BY cell) * ?), 1) AS quota
+                FROM (SELECT {_q(x)}, {_q(y)}, {cell} AS cell, (rowid * 2654435761) % 4294967296 AS h
+                      FROM {self.table} WHERE {where}))
+            WHERE r <= quota
+            ORDER BY r > 1, (r - 1 + h / 4294967296.0) / quota
+            LIMIT ?""", [budget / total] + cell_params + params + [budget])
+        return Scatter(points, None, total)
@@ -0,0 +1,12 @@
+"""Helpers shared by the benchmark scripts."""
+import time
+
+
+def best_time(fn, repeat):
+    """Fastest of ``repeat`` calls of ``fn``, in seconds."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
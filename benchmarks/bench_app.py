@@ -0,0 +1,255 @@
+"""Headless page benchmark: every page of app.py rendered through AppTest.
+
+For each scale, synthetic rides (:mod:`benchmarks.synthetic`) are written to
+a scratch directory laid out like the repo (rides_no_outliers.csv,
+ola_rides.db built by ingest.py, images/).  A fresh interpreter then renders
+Home, each EDA tab, each SQL query and each Insights section in turn with
+Streamlit's AppTest and records, per step, the wall time of the rerun, its
+peak RSS and the bytes of the elements sent to the browser; per chart, the
+time since the previous element (building the figure and serializing it)
+and its figure JSON size.  The first step is the cold start, data load
+included.
+
+    python -m benchmarks.bench_app --rows 100000 1000000 10000000 50000000 --out bench_app.json
+    python -m benchmarks.bench_app --rows 1000000 --compare bench_app.json
+"""
+import argparse
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+PAGES = ["Home", "Exploratory Data Analysis", "SQL Queries", "Insights & Recommendations"]
+EDA_TAB_KEY = "eda_tab"
+
+
+# -----------------------
+# Setup (parent process)
+# -----------------------
+def prepare(workdir, n_rows, log):
+    """Synthetic CSV and database for ``n_rows`` in ``workdir``; existing files are reused."""
+    from benchmarks.synthetic import write_rides
+    from ingest import ingest
+
+    os.makedirs(workdir, exist_ok=True)
+    csv_path = os.path.join(workdir, "rides_no_outliers.csv")
+    db_path = os.path.join(workdir, "ola_rides.db")
+    setup = {}
+    if not os.path.exists(csv_path):
+        start = time.perf_counter()
+        write_rides(n_rows, csv_path)
+        setup["generate_seconds"] = round(time.perf_counter() - start, 2)
+    if not os.path.exists(db_path):
+        start = time.perf_counter()
+        scratch = os.path.join(workdir, "ingest.snapshot")
+        ingest(csv_path, db_path, scratch, chunksize=500_000, log=log)
+        shutil.rmtree(scratch, ignore_errors=True)
+        setup["ingest_seconds"] = round(time.perf_counter() - start, 2)
+    if not os.path.exists(os.path.join(workdir, "images")):
+        os.symlink(os.path.join(ROOT, "images"), os.path.join(workdir, "images"))
+    setup["csv_mb"] = round(os.path.getsize(csv_path) / 2**20, 1)
+    return setup
+
+
+# -----------------------
+# Rendering (child process)
+# -----------------------
+def _reset_peak_rss():
+    # Writing 5 to clear_refs resets VmHWM on Linux; elsewhere peaks are per process.
+    try:
+        with open("/proc/self/clear_refs", "w") as fh:
+            fh.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss_mb():
+    try:
+        with open("/proc/self/status") as fh:
+            for line in fh:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class ElementRecorder:
+    """Records every element a rerun sends, with the time since the previous one."""
+
+    def __init__(self):
+        from streamlit.delta_generator import DeltaGenerator
+
+        self.elements = []
+        self._last = time.perf_counter()
+        original = DeltaGenerator._enqueue
+        recorder = self
+
+        def _enqueue(dg, delta_type, element_proto, *args, **kwargs):
+            out = original(dg, delta_type, element_proto, *args, **kwargs)
+            now = time.perf_counter()
+            recorder.elements.append((delta_type, element_proto, now - recorder._last))
+            recorder._last = now
+            return out
+
+        DeltaGenerator._enqueue = _enqueue
+
+    def start(self):
+        self.elements = []
+        self._last = time.perf_counter()
+
+    def charts(self):
+        out = []
+        for delta_type, proto, seconds in self.elements:
+            if delta_type == "plotly_chart":
+                title = json.loads(proto.spec).get("layout", {}).get("title", {}).get("text")
+                out.append({"title": title, "seconds": round(seconds, 4), "bytes": len(proto.spec)})
+        return out
+
+
+def _step(at, recorder, page, view, timeout):
+    _reset_peak_rss()
+    recorder.start()
+    start = time.perf_counter()
+    at.run(timeout=timeout)
+    seconds = time.perf_counter() - start
+    if at.exception:
+        raise RuntimeError(f"{page} / {view}: {at.exception[0].message}")
+    charts = recorder.charts()
+    return {
+        "page": page,
+        "view": view,
+        "seconds": round(seconds, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "payload_bytes": sum(proto.ByteSize() for _, proto, _ in recorder.elements),
+        "figure_bytes": sum(c["bytes"] for c in charts),
+        "charts": charts,
+    }
+
+
+def render_pages(timeout):
+    """Every step of every page, rendered in this process with the cwd as the data directory."""
+    from streamlit.testing.v1 import AppTest
+
+    recorder = ElementRecorder()
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    steps = [_step(at, recorder, "Home", "cold start", timeout)]
+    for page in PAGES:
+        at.sidebar.radio[0].set_value(page)
+        # The page's first view is whatever it opens with; it is named once rendered.
+        first = _step(at, recorder, page, None, timeout)
+        steps.append(first)
+        if page == "Exploratory Data Analysis":
+            first["view"] = at.tabs[0].label
+            for tab in at.tabs[1:]:
+                at.session_state[EDA_TAB_KEY] = tab.label
+                steps.append(_step(at, recorder, page, tab.label, timeout))
+        elif page == "SQL Queries":
+            first["view"] = at.selectbox[0].value
+            for query in at.selectbox[0].options[1:]:
+                at.selectbox[0].set_value(query)
+                steps.append(_step(at, recorder, page, query, timeout))
+        elif page == "Insights & Recommendations":
+            # One section open at a time, so each step carries only its own chart.
+            sections = [(e.key, e.label) for e in at.expander]
+            first["view"] = sections[0][1]
+            for key, label in sections[1:]:
+                for other, _ in sections:
+                    at.session_state[other] = other == key
+                steps.append(_step(at, recorder, page, label, timeout))
+    return steps
+
+
+def _render_main(workdir, timeout):
+    sys.path.insert(0, ROOT)
+    os.chdir(workdir)
+    print(json.dumps(render_pages(timeout)))
+
+
+# -----------------------
+# Report
+# -----------------------
+def page_totals(steps):
+    totals = {}
+    for step in steps:
+        page = totals.setdefault(step["page"] if step["view"] != "cold start" else "cold start",
+                                 {"seconds": 0.0, "peak_rss_mb": 0.0, "payload_bytes": 0, "figure_bytes": 0})
+        page["seconds"] = round(page["seconds"] + step["seconds"], 4)
+        page["peak_rss_mb"] = max(page["peak_rss_mb"], step["peak_rss_mb"])
+        page["payload_bytes"] += step["payload_bytes"]
+        page["figure_bytes"] += step["figure_bytes"]
+    return totals
+
+
+def compare(results, baseline, tolerance):
+    """Print page time ratios against ``baseline``; True if any page regressed past ``tolerance``."""
+    base = {(r["rows"], r["backend"]): r["pages"] for r in baseline}
+    regressed = False
+    print(f"\n{'rows':>10} {'backend':>8} {'page':>28} {'base_s':>8} {'now_s':>8} {'ratio':>6}")
+    for result in results:
+        for page, now in result["pages"].items():
+            old = base.get((result["rows"], result["backend"]), {}).get(page)
+            if not old:
+                continue
+            ratio = now["seconds"] / max(old["seconds"], 1e-9)
+            flag = " !" if ratio > tolerance else ""
+            regressed |= bool(flag)
+            print(f"{result['rows']:>10} {result['backend']:>8} {page:>28} {old['seconds']:>8.2f} "
+                  f"{now['seconds']:>8.2f} {ratio:>6.2f}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 10_000_000, 50_000_000])
+    parser.add_argument("--backend", nargs="+", choices=["pandas", "sqlite"], default=["pandas", "sqlite"])
+    parser.add_argument("--workdir", help="keep generated data here (reused by later runs) instead of a temp dir")
+    parser.add_argument("--timeout", type=float, default=3600, help="seconds allowed per rerun")
+    parser.add_argument("--out", help="write the results as JSON")
+    parser.add_argument("--compare", help="a previous --out file to compare page times against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="slowdown ratio reported as a regression")
+    parser.add_argument("--render", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.render:
+        _render_main(args.render, args.timeout)
+        return
+
+    log = lambda msg: print(msg, file=sys.stderr)
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'rows':>10} {'backend':>8} {'page':>28} {'view':>40} {'seconds':>8} {'peak_mb':>8} {'payload_kb':>10}")
+        for n in args.rows:
+            workdir = os.path.join(args.workdir or tmp, f"rides_{n}")
+            setup = prepare(workdir, n, log)
+            for backend in args.backend:
+                # Each run in a fresh interpreter, so caches and peak RSS start clean.
+                env = dict(os.environ, OLA_BACKEND=backend, OLA_REFRESH_SECONDS="1e9")
+                out = subprocess.run([sys.executable, "-m", "benchmarks.bench_app", "--render", workdir,
+                                      "--timeout", str(args.timeout)],
+                                     cwd=ROOT, env=env, check=True, stdout=subprocess.PIPE, text=True).stdout
+                steps = json.loads(out.strip().splitlines()[-1])
+                for step in steps:
+                    print(f"{n:>10} {backend:>8} {step['page'][:28]:>28} {str(step['view'])[:40]:>40} "
+                          f"{step['seconds']:>8.2f} {step['peak_rss_mb']:>8.0f} {step['payload_bytes'] / 1024:>10.1f}")
+                results.append({"rows": n, "backend": backend, "setup": setup,
+                                "pages": page_totals(steps), "steps": steps})
+            if not args.workdir:
+                shutil.rmtree(workdir)
+
+    if args.out:
+        with open(args.out, "w") as fh:
+            json.dump(results, fh, indent=2)
+    if args.compare:
+        with open(args.compare) as fh:
+            if compare(results, json.load(fh), args.tolerance):
+                sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
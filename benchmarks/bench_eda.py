@@ -0,0 +1,66 @@
+"""EDA + Insights aggregation cost: fused bincount engine vs per-chart pandas.
+
+Both sides compute every groupby/value_counts aggregation behind the two
+pages (charts that plot raw rows -- box, histograms, scatter -- excluded).
+
+    python -m benchmarks.bench_eda --rows 100000 1000000
+"""
+import argparse
+
+from benchmarks._util import best_time
+from benchmarks.synthetic import generate_rides
+from data_store import CATEGORICAL_COLUMNS, RideStore
+from fused import EDA_AGGS, INSIGHTS_AGGS, run
+
+FULL_AGGS = dict(EDA_AGGS, **INSIGHTS_AGGS)
+
+
+def pandas_pages(df):
+    """The original app.py aggregations, one pass per chart."""
+    return [
+        df["Vehicle_Type"].value_counts(),
+        df.groupby("Date")["Booking_ID"].count(),
+        df["Payment_Method"].value_counts(),
+        df["Day_of_Week"].value_counts(),
+        df["Ride_Hour"].value_counts(),
+        df[df["Booking_Status"].str.contains("Canceled")].groupby("Date")["Booking_ID"].count(),
+        df["Pickup_Location"].value_counts().head(10),
+        df["Drop_Location"].value_counts().head(10),
+        df.groupby("Date")["Booking_Value"].sum(),
+        df.groupby("Vehicle_Type")["Ride_Distance"].mean(),
+        df.groupby("Vehicle_Type")["Customer_Rating"].mean(),
+        df[df["Booking_Status"] == "Canceled by Customer"]["Pickup_Location"].value_counts().head(10),
+        df[df["Incomplete_Rides"] == "Yes"]["Incomplete_Rides_Reason"].value_counts(),
+        df["Customer_ID"].value_counts().head(10),
+        df.groupby("Payment_Method")["Booking_Value"].mean(),
+        df["Booking_Status"].value_counts(),
+        df["Canceled_Rides_by_Driver"].value_counts().head(5),
+        df["Canceled_Rides_by_Customer"].value_counts().head(5),
+        df.groupby("Vehicle_Type")["Booking_Value"].sum(),
+        df.groupby("Ride_Week")["Booking_Value"].sum(),
+        df[df["Booking_Status"].str.contains("Canceled", na=False)]["Pickup_Location"].value_counts().head(10),
+        df.groupby("Customer_ID")["Booking_Value"].sum().sort_values(ascending=False).head(10),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'layout':>9} {'pandas_ms':>10} {'fused_ms':>9} {'speedup':>8}")
+    for n in args.rows:
+        raw = generate_rides(n)
+        coded = raw.copy()
+        for col in CATEGORICAL_COLUMNS + ["Customer_ID"]:
+            coded[col] = coded[col].astype("category")
+        for layout, df in (("object", raw), ("category", coded)):
+            df = RideStore(df).df
+            t_pandas = best_time(lambda: pandas_pages(df), args.repeat)
+            t_fused = best_time(lambda: run(df, FULL_AGGS), args.repeat)
+            print(f"{n:>10} {layout:>9} {t_pandas * 1e3:>10.1f} {t_fused * 1e3:>9.1f} {t_pandas / t_fused:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
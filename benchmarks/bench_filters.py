@@ -0,0 +1,57 @@
+"""Sidebar filter latency: BitmapIndex vs chained boolean masks.
+
+    python -m benchmarks.bench_filters --rows 100000 1000000 4000000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from benchmarks._util import best_time
+from benchmarks.synthetic import generate_rides
+from bitmaps import BitmapIndex
+from data_store import CATEGORICAL_COLUMNS, RideStore
+
+FILTERS = {
+    "Vehicle_Type": ["Auto", "Mini"],
+    "Booking_Status": ["Success"],
+    "Pickup_Location": ["Whitefield", "Hebbal", "MG Road"],
+    "Ride_Hour": [8, 9, 17, 18],
+}
+
+
+def scan_select(df, filters, start, end):
+    """The chained-mask selection the bitmaps replace."""
+    mask = df["Date"].between(start, end)
+    for column, values in filters.items():
+        mask &= df[column].isin(values)
+    return np.flatnonzero(mask.to_numpy())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 4_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'build_s':>9} {'bitmap_ms':>10} {'scan_ms':>9} {'selected':>9}")
+    for n in args.rows:
+        df = generate_rides(n)
+        for col in CATEGORICAL_COLUMNS:
+            df[col] = df[col].astype("category")
+        store = RideStore(df)
+        start = time.perf_counter()
+        index = BitmapIndex(store)
+        build = time.perf_counter() - start
+
+        a = (store.min_date + (store.max_date - store.min_date) / 4).normalize()
+        b = store.max_date
+        rows = index.select(FILTERS, a, b)
+        assert np.array_equal(rows, scan_select(store.df, FILTERS, a, b))
+        bitmap = best_time(lambda: index.select(FILTERS, a, b), args.repeat)
+        scan = best_time(lambda: scan_select(store.df, FILTERS, a, b), args.repeat)
+        print(f"{n:>10} {build:>9.2f} {bitmap * 1e3:>10.3f} {scan * 1e3:>9.1f} {len(rows):>9}")
+
+
+if __name__ == "__main__":
+    main()
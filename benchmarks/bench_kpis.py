@@ -0,0 +1,37 @@
+"""KPI latency: prefix-sum KpiIndex vs the original pandas scan.
+
+    python -m benchmarks.bench_kpis --rows 100000 1000000 4000000
+"""
+import argparse
+import time
+
+from benchmarks._util import best_time
+from benchmarks.synthetic import generate_rides
+from data_store import RideStore
+from kpis import KpiIndex, scan_kpis
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000, 4_000_000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'build_s':>9} {'prefix_ms':>10} {'scan_ms':>9}")
+    for n in args.rows:
+        df = generate_rides(n)
+        for col in ("Booking_Status", "Vehicle_Type", "Payment_Method"):
+            df[col] = df[col].astype("category")
+        store = RideStore(df)
+        start = time.perf_counter()
+        index = KpiIndex(store)
+        build = time.perf_counter() - start
+
+        a, b = store.min_date + (store.max_date - store.min_date) / 4, store.max_date
+        prefix = best_time(lambda: index.summary(a, b), args.repeat)
+        scan = best_time(lambda: scan_kpis(store.filter_by_dates(a, b)), args.repeat)
+        print(f"{n:>10} {build:>9.2f} {prefix * 1e3:>10.3f} {scan * 1e3:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Index build time: single-pass constructors vs partitioned Precompute.
+
+Builds the KPI, distribution, rollup and top-k indexes for a synthetic
+snapshot directly, then with :class:`precompute.Precompute` at each worker
+count, then appends one day of rides and reruns the last Precompute.
+
+    python -m benchmarks.bench_precompute --rows 1000000 4000000 --workers 1 2 4 8
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import generate_rides
+from data_store import RideStore, read_snapshot, write_snapshot
+from fused import EDA_AGGS, INSIGHTS_AGGS
+from kpis import KpiIndex
+from precompute import Precompute
+from rollup import RollupCube
+from sketches import DistributionIndex
+from topk import TopKIndex
+
+FULL_AGGS = dict(EDA_AGGS, **INSIGHTS_AGGS)
+
+
+def direct(store):
+    return KpiIndex(store), DistributionIndex(store), RollupCube(store), TopKIndex(store, FULL_AGGS)
+
+
+def _same(a, b):
+    kpis, dists, cube, topk = a
+    assert all(np.allclose(kpis.cum[k], b.kpis.cum[k]) for k in kpis.cum)
+    assert np.array_equal(dists.value_cum, b.dists.value_cum)
+    assert np.isclose(cube.cells["Booking_Value_sum"].sum(), b.cube.cells["Booking_Value_sum"].sum())
+    start, end = topk.store.min_date, topk.store.max_date
+    assert all(topk.query(name, start, end).equals(b.topk.query(name, start, end)) for name in topk.aggs)
+
+
+def _snapshot(df, path):
+    write_snapshot(df.sort_values("Date", kind="stable", ignore_index=True), path, {"kind": "bench"})
+    return RideStore(read_snapshot(path, text=False))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    args = parser.parse_args()
+
+    print(f"{'rows':>10} {'build':>14} {'seconds':>8} {'recomputed':>11}")
+    for n in args.rows:
+        df = generate_rides(n, days=91)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rides.snapshot")
+            store = _snapshot(df, path)
+            start = time.perf_counter()
+            expected = direct(store)
+            print(f"{n:>10} {'direct':>14} {time.perf_counter() - start:>8.2f} {'':>11}")
+
+            for workers in sorted(set(args.workers)):
+                pre = Precompute(FULL_AGGS, workers=workers)
+                _same(expected, pre.run(store, path))
+                print(f"{n:>10} {f'{workers} workers':>14} {pre.stats['seconds']:>8.2f} "
+                      f"{pre.stats['recomputed']:>5}/{pre.stats['partitions']:<5}")
+
+            day = generate_rides(max(n // 91, 1), start=str(df["Date"].max() + pd.Timedelta(days=1)), days=1, seed=1)
+            day["Booking_ID"] = "NEW" + day["Booking_ID"].str[3:]
+            store = _snapshot(pd.concat([df, day], ignore_index=True), path)
+            indexes = pre.run(store, path)
+            _same(direct(store), indexes)
+            print(f"{n:>10} {'+1 day':>14} {pre.stats['seconds']:>8.2f} "
+                  f"{pre.stats['recomputed']:>5}/{pre.stats['partitions']:<5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""Synthetic Ola rides data matching the schema of rides_no_outliers.csv.
+
+The category mixes (Booking_Status, Vehicle_Type, Payment_Method, skewed
+pickup/drop locations) and the Booking_Value, Ride_Distance and rating
+distributions approximate the real July 2024 data.  Large files are written in
+chunks, so 50M rows need no more memory than one chunk.
+
+    python -m benchmarks.synthetic 1000000 rides_1m.csv
+"""
+import argparse
+
+import numpy as np
+import pandas as pd
+
+STATUSES = ["Success", "Canceled by Driver", "Canceled by Customer", "Driver Not Found"]
+STATUS_P = [0.6207, 0.1785, 0.1015, 0.0993]
+VEHICLES = ["Auto", "Bike", "eBike", "Mini", "Prime Plus", "Prime Sedan", "Prime SUV"]
+VEHICLE_P = [0.15, 0.13, 0.16, 0.13, 0.14, 0.15, 0.14]
+PAYMENTS = ["Cash", "UPI", "Credit Card", "Debit Card"]
+PAYMENT_P = [0.40, 0.45, 0.10, 0.05]
+LOCATIONS = [
+    "Vijayanagar", "Tumkur Road", "Whitefield", "Banashankari", "Hebbal", "Indiranagar",
+    "Koramangala", "Jayanagar", "HSR Layout", "Electronic City", "Marathahalli", "Yelahanka",
+    "Malleshwaram", "BTM Layout", "Rajajinagar", "Basavanagudi", "MG Road", "Hosur Road",
+    "Peenya", "KR Puram", "Bellandur", "Domlur", "Frazer Town", "RT Nagar", "Kengeri",
+    "Banaswadi", "Ulsoor", "Sarjapur Road", "JP Nagar", "Nagarbhavi",
+]
+DRIVER_REASONS = ["Personal & Car related issue", "Customer related issue",
+                  "More than permitted people in there", "The customer was coughing/sick"]
+CUSTOMER_REASONS = ["Driver is not moving towards pickup location", "Driver asked to cancel",
+                    "Change of plans", "AC is not working", "Wrong Address"]
+INCOMPLETE_REASONS = ["Customer Demand", "Vehicle Breakdown", "Other Issue"]
+
+
+def _ids(prefix, numbers, width):
+    return np.char.add(prefix, np.char.zfill(numbers.astype(str), width)).astype(object)
+
+
+def generate_rides(n_rows, start="2024-07-01", days=31, seed=0, first_id=0, n_customers=None):
+    """Return a DataFrame of ``n_rows`` synthetic rides spread over ``days`` days.
+
+    Booking IDs are numbered from ``first_id``; customers are drawn from
+    ``n_customers`` IDs (a third of ``n_rows`` by default).
+    """
+    rng = np.random.default_rng(seed)
+    day = rng.integers(0, days, n_rows)
+    seconds = rng.integers(0, 24 * 3600, n_rows)
+    dates = pd.Timestamp(start) + pd.to_timedelta(day, unit="D")
+    times = pd.to_timedelta(seconds, unit="s")
+
+    status = rng.choice(len(STATUSES), n_rows, p=STATUS_P)
+    success = status == 0
+    vehicle = rng.choice(len(VEHICLES), n_rows, p=VEHICLE_P)
+    pickup = rng.zipf(1.3, n_rows) % len(LOCATIONS)
+    drop = rng.zipf(1.3, n_rows) % len(LOCATIONS)
+    n_customers = n_customers or max(n_rows // 3, 1)
+    customer = rng.integers(0, n_customers, n_rows)
+
+    payment = np.where(success, np.array(PAYMENTS, dtype=object)[rng.choice(4, n_rows, p=PAYMENT_P)],
+                       "Not Applicable")
+    value = np.round(rng.lognormal(5.9, 0.6, n_rows)).clip(100, 2500)
+    distance = np.where(success, np.round(rng.gamma(2.0, 11.5, n_rows), 1).clip(1, 50), 0.0)
+    driver_rating = np.where(success, np.round(rng.normal(4.0, 0.35, n_rows).clip(3.0, 5.0), 1), np.nan)
+    customer_rating = np.where(success, np.round(rng.normal(4.0, 0.35, n_rows).clip(3.0, 5.0), 1), np.nan)
+
+    driver_cancel = np.where(status == 1, np.array(DRIVER_REASONS, dtype=object)[
+        rng.integers(0, len(DRIVER_REASONS), n_rows)], None)
+    customer_cancel = np.where(status == 2, np.array(CUSTOMER_REASONS, dtype=object)[
+        rng.integers(0, len(CUSTOMER_REASONS), n_rows)], None)
+    incomplete = success & (rng.random(n_rows) < 0.06)
+    incomplete_reason = np.where(incomplete, np.array(INCOMPLETE_REASONS, dtype=object)[
+        rng.integers(0, len(INCOMPLETE_REASONS), n_rows)], None)
+
+    ride_dt = dates + times
+    df = pd.DataFrame({
+        "Date": dates,
+        "Time": ride_dt.strftime("%H:%M:%S"),
+        "Booking_ID": _ids("CNR", first_id + np.arange(n_rows), 8),
+        "Booking_Status": np.array(STATUSES, dtype=object)[status],
+        "Customer_ID": _ids("CID", customer, 7),
+        "Vehicle_Type": np.array(VEHICLES, dtype=object)[vehicle],
+        "Pickup_Location": np.array(LOCATIONS, dtype=object)[pickup],
+        "Drop_Location": np.array(LOCATIONS, dtype=object)[drop],
+        "V_TAT": np.where(success, rng.integers(30, 200, n_rows), np.nan),
+        "C_TAT": np.where(success, rng.integers(30, 200, n_rows), np.nan),
+        "Canceled_Rides_by_Customer": customer_cancel,
+        "Canceled_Rides_by_Driver": driver_cancel,
+        "Incomplete_Rides": np.where(success, np.where(incomplete, "Yes", "No"), None),
+        "Incomplete_Rides_Reason": incomplete_reason,
+        "Booking_Value": value,
+        "Payment_Method": payment,
+        "Ride_Distance": distance,
+        "Driver_Ratings": driver_rating,
+        "Customer_Rating": customer_rating,
+        "Ride_Hour": ride_dt.hour,
+        "Ride_Week": ride_dt.isocalendar().week.to_numpy(),
+        "Day_of_Week": ride_dt.day_name(),
+    })
+    return df
+
+
+def write_rides(n_rows, path, start="2024-07-01", days=31, seed=0, chunk_rows=1_000_000):
+    """Write ``n_rows`` synthetic rides to the CSV ``path``, ``chunk_rows`` at a time."""
+    n_customers = max(n_rows // 3, 1)
+    for i, lo in enumerate(range(0, n_rows, chunk_rows)):
+        chunk = generate_rides(min(chunk_rows, n_rows - lo), start, days, seed=seed + i,
+                               first_id=lo, n_customers=n_customers)
+        chunk.to_csv(path, mode="a" if i else "w", header=not i, index=False)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("rows", type=int)
+    parser.add_argument("out")
+    parser.add_argument("--days", type=int, default=31)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--chunk-rows", type=int, default=1_000_000)
+    args = parser.parse_args()
+    write_rides(args.rows, args.out, days=args.days, seed=args.seed, chunk_rows=args.chunk_rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Packed per-value bitmaps behind the sidebar filters.
+
+For every filter column and every value, one bit per row of the Date-sorted
+:class:`data_store.RideStore`, packed 64 rows to a ``uint64`` word.  A
+selection ORs the bitmaps of the chosen values within a column and ANDs
+the columns together, touching only the words that cover the date range's
+rows, so a filter costs a few word-wise operations over ``rows / 64`` words
+instead of chained boolean masks over the string columns.
+"""
+import numpy as np
+
+from fused import _codes
+
+# Columns offered as sidebar filters, in display order.
+FILTER_COLUMNS = ["Vehicle_Type", "Booking_Status", "Payment_Method", "Pickup_Location", "Ride_Hour"]
+
+
+def _pack(mask, n_words):
+    bits = np.packbits(mask, bitorder="little")
+    words = np.zeros(n_words * 8, dtype=np.uint8)
+    words[:len(bits)] = bits
+    return words.view("<u8")
+
+
+class BitmapIndex:
+    """Per-value row bitmaps for ``columns`` of a :class:`data_store.RideStore`."""
+
+    def __init__(self, store, columns=FILTER_COLUMNS):
+        self.store = store
+        self.n_words = -(-len(store) // 64)
+        self.labels, self.slots, self.bitmaps = {}, {}, {}
+        codes_cache = {}
+        for column in columns:
+            codes, labels = _codes(store.df, column, codes_cache)
+            # Sorting once groups each value's rows, so every bitmap is set
+            # from its own rows instead of a comparison over the whole column.
+            order = np.argsort(codes, kind="stable")
+            bounds = np.searchsorted(codes[order], np.arange(len(labels) + 2))
+            bitmaps = np.zeros((len(labels), self.n_words), dtype="<u8")
+            mask = np.zeros(len(store), dtype=bool)
+            for slot in range(len(labels)):
+                rows = order[bounds[slot + 1]:bounds[slot + 2]]
+                if len(rows):
+                    mask[rows] = True
+                    bitmaps[slot] = _pack(mask, self.n_words)
+                    mask[rows] = False
+            present = bitmaps.any(axis=1)
+            self.labels[column] = labels[present].tolist()
+            self.slots[column] = {label: i for i, label in enumerate(self.labels[column])}
+            self.bitmaps[column] = bitmaps[present]
+
+    def options(self):
+        """``{column: values}`` present in the data, for the filter widgets."""
+        return {column: sorted(labels) for column, labels in self.labels.items()}
+
+    def select(self, filters, start, end):
+        """Row positions in ``start..end`` matching every ``{column: values}`` filter."""
+        lo, hi = self.store.row_range(start, end)
+        w0, w1 = lo // 64, -(-hi // 64)
+        acc = None
+        for column, values in filters.items():
+            bitmaps = self.bitmaps[column]
+            words = np.zeros(w1 - w0, dtype="<u8")
+            for value in values:
+                if value in self.slots[column]:
+                    np.bitwise_or(words, bitmaps[self.slots[column][value], w0:w1], out=words)
+            acc = words if acc is None else np.bitwise_and(acc, words, out=acc)
+        if acc is None:
+            return np.arange(lo, hi)
+        # Unpack only the non-empty words: cheap when the selection is sparse.
+        words = np.flatnonzero(acc)
+        bits = np.unpackbits(acc[words].view(np.uint8), bitorder="little").reshape(len(words), 64)
+        word, bit = np.nonzero(bits)
+        rows = (words[word] + w0) * 64 + bit
+        return rows[(rows >= lo) & (rows < hi)]
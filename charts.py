@@ -0,0 +1,132 @@
+"""The Plotly figures of the EDA and Insights pages.
+
+Every builder takes ``(backend, start, end, agg)``: ``agg(name)`` returns
+one of the page's declared aggregations (:data:`fused.EDA_AGGS`,
+:data:`fused.INSIGHTS_AGGS`) for the range, so the app can serve it from
+its session cache and export.py from one fused backend run.  The charts
+that plot rows rather than aggregates ask ``backend`` directly.
+
+Both dicts are in page order.
+"""
+import plotly.graph_objects as go
+
+from plots import SCATTER_POINT_BUDGET, scatter_figure
+from sketches import box_figure, histogram_figure
+
+
+# -----------------------
+# Figure Builders
+# -----------------------
+# The same single-trace figures as px.bar / px.line / px.pie (axis titles,
+# hover text), built straight from graph objects: px spends ~50 ms per call
+# on argument processing, ten times what the figure itself costs.
+def _hover(x, y, labels):
+    return f"{labels.get(x, x)}=%{{x}}<br>{labels.get(y, y)}=%{{y}}<extra></extra>"
+
+
+def bar_figure(frame, x, y, title, labels=None):
+    labels = labels or {}
+    fig = go.Figure(go.Bar(x=frame[x], y=frame[y], hovertemplate=_hover(x, y, labels)))
+    fig.update_layout(title=title, xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y))
+    return fig
+
+
+def line_figure(frame, x, y, title, labels=None):
+    labels = labels or {}
+    fig = go.Figure(go.Scatter(x=frame[x], y=frame[y], mode="lines", hovertemplate=_hover(x, y, labels)))
+    fig.update_layout(title=title, xaxis_title=labels.get(x, x), yaxis_title=labels.get(y, y))
+    return fig
+
+
+def pie_figure(frame, names, values, title):
+    fig = go.Figure(go.Pie(labels=frame[names], values=frame[values],
+                           hovertemplate=f"{names}=%{{label}}<br>{values}=%{{value}}<extra></extra>"))
+    fig.update_layout(title=title)
+    return fig
+
+
+def _histogram(column, title):
+    return lambda backend, start, end, agg: histogram_figure(
+        *backend.histogram(column, start, end), column, title)
+
+
+def _scatter(title, **kwargs):
+    return lambda backend, start, end, agg: scatter_figure(
+        backend.scatter("Ride_Distance", "Booking_Value", start, end, budget=SCATTER_POINT_BUDGET),
+        "Ride_Distance", "Booking_Value", title, **kwargs)
+
+
+# -----------------------
+# Page Charts
+# -----------------------
+EDA_FIGURES = {
+    # Demand
+    "eda_1": lambda backend, start, end, agg: bar_figure(
+        agg("vehicle"), x="Vehicle_Type", y="count", title="Rides by Vehicle Type",
+        labels={"Vehicle_Type": "Vehicle Type", "count": "Number of Rides"}),
+    "eda_2": lambda backend, start, end, agg: line_figure(
+        agg("daily_rides"), x="Date", y="count", title="Daily Booking Trend",
+        labels={"count": "Number of Rides"}),
+    "eda_7": lambda backend, start, end, agg: bar_figure(
+        agg("weekday"), x="Day_of_Week", y="count", title="Rides by Day of Week"),
+    "eda_8": lambda backend, start, end, agg: bar_figure(
+        agg("hour"), x="Ride_Hour", y="count", title="Rides by Hour of Day"),
+    # Revenue & Payments
+    "eda_3": lambda backend, start, end, agg: pie_figure(
+        agg("payment"), names="Payment_Method", values="count", title="Payment Method Distribution"),
+    "eda_4": lambda backend, start, end, agg: box_figure(
+        backend.box_stats(start, end), "Booking Value by Vehicle Type"),
+    "eda_13": lambda backend, start, end, agg: line_figure(
+        agg("daily_value").set_axis(["Date", "total_value"], axis=1),
+        x="Date", y="total_value", title="Daily Booking Value Trend"),
+    "eda_17": _scatter("Booking Value vs Ride Distance", opacity=0.5),
+    "eda_20": lambda backend, start, end, agg: bar_figure(
+        agg("avg_payment_value"), x="Payment_Method", y="Booking_Value",
+        title="Avg Booking Value by Payment Method"),
+    # Ratings & Distance
+    "eda_5": _histogram("Customer_Rating", "Distribution of Customer Ratings"),
+    "eda_6": _histogram("Driver_Ratings", "Distribution of Driver Ratings"),
+    "eda_9": _histogram("Ride_Distance", "Ride Distance Distribution"),
+    "eda_14": lambda backend, start, end, agg: bar_figure(
+        agg("avg_distance"), x="Vehicle_Type", y="Ride_Distance", title="Average Ride Distance by Vehicle Type"),
+    "eda_15": lambda backend, start, end, agg: bar_figure(
+        agg("avg_rating"), x="Vehicle_Type", y="Customer_Rating", title="Avg Customer Rating by Vehicle Type"),
+    # Cancellations
+    "eda_10": lambda backend, start, end, agg: line_figure(
+        agg("daily_cancellations"), x="Date", y="count", title="Daily Cancellations Trend"),
+    "eda_16": lambda backend, start, end, agg: bar_figure(
+        agg("customer_cancel_pickups"), x="Pickup_Location", y="count", title="Top Customer Cancellation Locations"),
+    "eda_18": lambda backend, start, end, agg: bar_figure(
+        agg("incomplete_reasons").set_axis(["Reason", "count"], axis=1),
+        x="Reason", y="count", title="Reasons for Incomplete Rides"),
+    # Locations & Customers
+    "eda_11": lambda backend, start, end, agg: bar_figure(
+        agg("top_pickups"), x="Pickup_Location", y="count", title="Top 10 Pickup Locations"),
+    "eda_12": lambda backend, start, end, agg: bar_figure(
+        agg("top_drops"), x="Drop_Location", y="count", title="Top 10 Drop Locations"),
+    "eda_19": lambda backend, start, end, agg: bar_figure(
+        agg("top_customers"), x="Customer_ID", y="count", title="Top 10 Customers by Ride Count"),
+}
+
+INSIGHTS_FIGURES = {
+    "ins_1": lambda backend, start, end, agg: pie_figure(
+        agg("status"), names="Booking_Status", values="count", title="Booking Status Breakdown"),
+    "ins_2": lambda backend, start, end, agg: bar_figure(
+        agg("driver_reasons").set_axis(["Reason", "Count"], axis=1),
+        x="Reason", y="Count", title="Driver Cancellation Reasons"),
+    "ins_3": lambda backend, start, end, agg: bar_figure(
+        agg("customer_reasons").set_axis(["Reason", "Count"], axis=1),
+        x="Reason", y="Count", title="Customer Cancellation Reasons"),
+    "ins_4": lambda backend, start, end, agg: bar_figure(
+        agg("revenue_by_vehicle"), x="Vehicle_Type", y="Booking_Value", title="Revenue by Vehicle Type"),
+    "ins_5": lambda backend, start, end, agg: line_figure(
+        agg("weekly_revenue"), x="Ride_Week", y="Booking_Value", title="Weekly Revenue Trends"),
+    "ins_6": _scatter("Distance vs Fare"),
+    "ins_7": lambda backend, start, end, agg: bar_figure(
+        agg("cancel_pickups").set_axis(["Pickup_Location", "Count"], axis=1),
+        x="Pickup_Location", y="Count", title="Top Cancellation Hotspots"),
+    "ins_8": _histogram("Driver_Ratings", "Driver Ratings Distribution"),
+    "ins_9": _histogram("Customer_Rating", "Customer Ratings Distribution"),
+    "ins_10": lambda backend, start, end, agg: bar_figure(
+        agg("high_value_customers"), x="Customer_ID", y="Booking_Value", title="Top 10 High-Value Customers"),
+}
@@ -0,0 +1,641 @@
+import os
+from collections import OrderedDict, namedtuple
+
+import streamlit as st
+
+from backends import PandasBackend, SQLiteBackend
+from bitmaps import FILTER_COLUMNS, BitmapIndex
+from charts import EDA_FIGURES, INSIGHTS_FIGURES
+from data_store import data_version, default_snapshot_dir, load_rides
+from fused import EDA_AGGS, INSIGHTS_AGGS
+from precompute import Precompute
+from profiling import Profiler, chrome_trace
+from refresh import DataRefresher
+from sql_engine import DatabaseVersion, QueryEngine, prepare_database
+
+# -----------------------
+# File Paths
+# -----------------------
+DB_PATH = "ola_rides.db"
+CSV_PATH = "rides_no_outliers.csv"
+LOGO_PATH = "images/ola-logo.png"
+
+# "pandas" serves the charts from the in-memory rides; "sqlite" pushes every
+# aggregation down to ola_rides.db and never loads the rows.
+DATA_BACKEND = os.environ.get("OLA_BACKEND", "pandas")
+
+# Figures and aggregation results each session keeps for reuse across reruns.
+CHART_CACHE_SIZE = 64
+
+# Processes that precompute the per-week aggregates (1 = in-process).
+PRECOMPUTE_WORKERS = int(os.environ.get("OLA_PRECOMPUTE_WORKERS", os.cpu_count() or 1))
+
+# How often the background refresher checks the CSV, snapshot and database for changes.
+REFRESH_SECONDS = float(os.environ.get("OLA_REFRESH_SECONDS", 10))
+
+# OLA_PROFILE=1 adds a sidebar panel timing data loading, filtering and every
+# chart (with tracemalloc memory and payload sizes); OLA_PROFILE_LOG=path also
+# appends the spans there as JSON lines.
+PROFILE = os.environ.get("OLA_PROFILE") == "1"
+PROFILE_LOG = os.environ.get("OLA_PROFILE_LOG")
+
+# -----------------------
+# Load Data
+# -----------------------
+Data = namedtuple("Data", ["backend", "engine", "profile"])
+
+
+def data_versions(kind, database_version):
+    # The SQLite backend only depends on the database.
+    return (data_version(CSV_PATH) if kind == "pandas" else None, database_version())
+
+
+def build_data(kind, version, previous, precompute):
+    """Backend and query engine for ``version``, reusing the parts that did not change."""
+    rides_version, database_version = version
+    profile = Profiler(PROFILE, "data load")
+    if previous is not None and previous.version[1] == database_version:
+        engine = previous.value.engine
+    else:
+        # A replaced database file needs its indexes and fresh connections.
+        with profile.span("prepare database", "load"):
+            prepare_database(DB_PATH)
+            engine = QueryEngine(DB_PATH)
+    if kind == "sqlite":
+        return Data(SQLiteBackend(engine), engine, profile)
+    if previous is not None and previous.version[0] == rides_version:
+        return Data(previous.value.backend, engine, profile)
+    # load_rides only re-parses the CSV if its content changed.  The columns are
+    # read-only maps of the snapshot, so app processes on the same host share one
+    # copy of the rows in the page cache.
+    with profile.span("load rides", "load"):
+        store = load_rides(CSV_PATH)
+    # Per-week partials in a process pool; only weeks whose rows changed are recomputed.
+    with profile.span("precompute indexes", "load"):
+        idx = precompute.run(store, default_snapshot_dir(CSV_PATH))
+    with profile.span("filter bitmaps", "load"):
+        bitmaps = BitmapIndex(store)
+    return Data(PandasBackend(store, idx.kpis, idx.dists, idx.cube, idx.topk, bitmaps), engine, profile)
+
+
+# Shared by every session.  The first load happens here; later data changes are
+# rebuilt by the refresher's background thread and swapped in between reruns.
+@st.cache_resource(show_spinner="Loading rides data...")
+def get_refresher(kind):
+    precompute = Precompute(dict(EDA_AGGS, **INSIGHTS_AGGS), workers=PRECOMPUTE_WORKERS)
+
+    def build(version, previous):
+        data = build_data(kind, version, previous, precompute)
+        if PROFILE_LOG:
+            data.profile.log(PROFILE_LOG, backend=kind)
+        return data
+
+    def retire(old, new):
+        # A replaced engine's pooled connections would keep file descriptors
+        # (and the inode of a replaced database file) open.
+        if old.engine is not new.engine:
+            old.engine.close()
+
+    database_version = DatabaseVersion(DB_PATH)
+    return DataRefresher(build, lambda: data_versions(kind, database_version),
+                         interval=REFRESH_SECONDS, retire=retire)
+
+
+def error_caption(frame, fmt="{:,.0f} rides"):
+    """Note the error bound of an approximate (top-k summary) leaderboard."""
+    bound = frame.attrs.get("error_bound")
+    if bound:
+        st.caption(f"≈ Approximate: each value may be undercounted by up to {fmt.format(bound)}, so the "
+                   f"entries shown and their order may differ from the exact ranking; "
+                   f"{frame.attrs.get('certain', 0)} of the {len(frame)} are certain to belong.")
+
+
+# -----------------------
+# Lazy Charts
+# -----------------------
+def session_cached(item_id, start, end, build):
+    """``build()`` once per session, date range, filters and data version; LRU-bounded."""
+    cache = st.session_state.setdefault("chart_cache", OrderedDict())
+    key = (item_id, start, end, filter_key, data_key)
+    if key in cache:
+        cache.move_to_end(key)
+    else:
+        cache[key] = build()
+        while len(cache) > CHART_CACHE_SIZE:
+            cache.popitem(last=False)
+    return cache[key]
+
+
+def aggregate(aggs, name, start, end):
+    """One declared aggregation, computed the first time a chart needs it."""
+    def build():
+        with profiler.span(name, "aggregate"):
+            return backend.run({name: aggs[name]}, start, end)[name]
+    return session_cached(name, start, end, build)
+
+
+def chart(figures, chart_id, start, end, agg):
+    """Draw ``figures[chart_id]`` (see charts.py), built the first time it is shown."""
+    def build():
+        with profiler.span(chart_id, "figure"):
+            return figures[chart_id](backend, start, end, agg)
+    fig = session_cached(chart_id, start, end, build)
+    with profiler.span(chart_id, "plotly_chart", payload=fig.to_json):
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# Taken once per rerun: a refresh that lands meanwhile is picked up by the next rerun.
+refresher = get_refresher(DATA_BACKEND)
+generation = refresher.current()
+backend, engine, load_profile = generation.value
+data_key = generation.number
+profiler = Profiler(PROFILE, "rerun")
+min_date, max_date = backend.date_bounds()
+
+st.set_page_config(page_title="Ola Rides Analysis", layout="wide")
+
+# -----------------------
+# Sidebar / Navigation
+# -----------------------
+st.sidebar.image(LOGO_PATH, width=150)
+st.sidebar.title("Navigation")
+page = st.sidebar.radio(
+    "Go to:",
+    ["Home", "Exploratory Data Analysis", "SQL Queries", "Power BI Dashboard", "Insights & Recommendations"]
+)
+
+# Global Date Filter
+st.sidebar.markdown("### Date Filter")
+date_range = st.sidebar.date_input(
+    "Select Date Range",
+    [min_date, max_date],
+    min_value=min_date,
+    max_value=max_date
+)
+# The picker returns a single date while a range is being selected.
+start_date, end_date = date_range[0], date_range[-1]
+
+# Filters (an empty selection keeps every value)
+st.sidebar.markdown("### Filters")
+filter_options = backend.filter_options()
+filters = {column: st.sidebar.multiselect(column.replace("_", " "), filter_options[column])
+           for column in FILTER_COLUMNS}
+backend = backend.filtered(filters, profiler)
+filter_key = tuple((column, tuple(values)) for column, values in backend.filters.items())
+
+# Data Status
+st.sidebar.caption(
+    f"🗂 Dataset v{generation.number} · loaded {generation.loaded_at:%Y-%m-%d %H:%M:%S} "
+    f"in {generation.seconds:.1f}s"
+)
+if refresher.error is not None:
+    st.sidebar.warning(f"Data refresh failed, still serving v{generation.number}: {refresher.error}")
+
+# -----------------------
+# HOME PAGE
+# -----------------------
+if page == "Home":
+    col1, col2 = st.columns([1, 5])
+    with col1:
+        st.image(LOGO_PATH, width=100)
+    with col2:
+        st.title("🚖 Ola Rides Analysis Dashboard")
+
+    # KPIs
+    with profiler.span("kpi summary", "aggregate"):
+        k = backend.kpi_summary(start_date, end_date)
+
+    kpi1, kpi2, kpi3, kpi4 = st.columns(4)
+    kpi1.metric("Total Rides", f"{k['total_rides']:,}")
+    kpi2.metric("Success Rate", f"{k['success_rate']:.2f}%")
+    kpi3.metric("Avg Fare (₹)", f"{k['avg_fare']:.0f}")
+    kpi4.metric("Cancellation Rate", f"{k['cancel_rate']:.2f}%")
+
+
+# -----------------------
+# EXPLORATORY DATA ANALYSIS PAGE
+# -----------------------
+elif page == "Exploratory Data Analysis":
+    st.header("📊 Exploratory Data Analysis")
+
+    def eda(name):
+        return aggregate(EDA_AGGS, name, start_date, end_date)
+
+    def eda_chart(chart_id):
+        chart(EDA_FIGURES, chart_id, start_date, end_date, eda)
+
+    # KPI Summary
+    st.subheader("📌 KPI Summary")
+    with profiler.span("kpi summary", "aggregate"):
+        k = backend.kpi_summary(start_date, end_date)
+    st.write(f"""
+    - **Total Rides:** {k['total_rides']:,}  
+    - **Successful Rides:** {k['successful_rides']:,}  
+    - **Success Rate:** {k['success_rate']:.2f}%  
+    - **Total Cancellations:** {k['total_cancellations']:,} ({k['not_success_rate']:.2f}%)  
+    - **Avg Fare (Success):** ₹{k['avg_fare']:.2f}  
+    - **Median Fare (Success):** ₹{k['median_fare']:.1f}  
+    - **Avg Distance (Success):** {k['avg_distance']:.2f} km  
+    - **Avg Driver Rating:** {k['avg_driver_rating']:.1f}  
+    - **Avg Customer Rating:** {k['avg_customer_rating']:.1f}
+    """)
+
+    # Only the selected tab's charts are computed and sent to the browser.
+    demand, revenue, quality, cancels, places = st.tabs(
+        ["🚖 Demand", "💰 Revenue & Payments", "⭐ Ratings & Distance", "❌ Cancellations", "📍 Locations & Customers"],
+        key="eda_tab", on_change="rerun")
+
+    with demand:
+        if demand.open:
+            # 1. Rides by Vehicle Type
+            eda_chart("eda_1")
+            st.caption("🔎 Insight: eBikes, Autos, and Prime vehicles account for most rides; Mini and Bike have slightly lower usage.")
+
+            # 2. Daily Booking Trend
+            eda_chart("eda_2")
+            st.caption("🔎 Insight: Ride demand peaks mid-week and drops slightly on weekends, showing weekday dominance.")
+
+            # 7. Rides by Day of Week
+            eda_chart("eda_7")
+            st.caption("🔎 Insight: Fridays and weekdays see the highest ride demand, while weekends are slightly lower.")
+
+            # 8. Rides by Hour
+            eda_chart("eda_8")
+            st.caption("🔎 Insight: Peak ride demand occurs during morning (8–10 AM) and evening (5–8 PM) commute hours.")
+
+    with revenue:
+        if revenue.open:
+            # 3. Payment Method Distribution
+            eda_chart("eda_3")
+            st.caption("🔎 Insight: UPI and Cash are the most popular payment methods; Credit Card usage is moderate and Not Applicable occurs for canceled/incomplete rides.")
+
+            # 4. Booking Value by Vehicle Type
+            eda_chart("eda_4")
+            st.caption("🔎 Insight: Prime Sedan, Prime SUV, and Mini vehicles generate higher fares compared to Bikes and Autos.")
+
+            # 13. Booking Value Trend
+            eda_chart("eda_13")
+            st.caption("🔎 Insight: Revenue peaks mid-week, dips on certain days, following ride volume trends.")
+
+            # 17. Booking Value vs Distance
+            eda_chart("eda_17")
+            st.caption("🔎 Insight: Booking value generally rises with ride distance, but short-distance rides can also have high fares due to vehicle type or surge pricing.")
+
+            # 20. Avg Booking Value by Payment Method
+            eda_chart("eda_20")
+            st.caption("🔎 Insight: UPI and Credit Card payments tend to have higher average booking values; Cash is common but lower value on average.")
+
+    with quality:
+        if quality.open:
+            # 5. Customer Rating Distribution
+            eda_chart("eda_5")
+            st.caption("🔎 Insight: Majority of customers rate rides around 4.0, with fewer extreme low/high ratings.")
+
+            # 6. Driver Ratings Distribution
+            eda_chart("eda_6")
+            st.caption("🔎 Insight: Most drivers have ratings around 4.0, indicating consistent positive feedback from customers.")
+
+            # 9. Ride Distance Distribution
+            eda_chart("eda_9")
+            st.caption("🔎 Insight: Most rides are short to medium distance; long-distance trips are rare.")
+
+            # 14. Average Ride Distance per Vehicle Type
+            eda_chart("eda_14")
+            st.caption("🔎 Insight: Mini, Prime Sedan, and SUVs cover longer average distances compared to Bikes and eBikes.")
+
+            # 15. Average Customer Rating by Vehicle Type
+            eda_chart("eda_15")
+            st.caption("🔎 Insight: Prime Plus, Prime Sedan, and SUVs receive slightly higher average customer ratings than other vehicle types.")
+
+    with cancels:
+        if cancels.open:
+            # 10. Cancellations Over Time
+            eda_chart("eda_10")
+            st.caption("🔎 Insight: Cancellations correlate with ride volume; more rides result in more cancellations, with driver and customer contributions visible.")
+
+            # 16. Customer Cancellations by Location
+            cust_cancel = eda("customer_cancel_pickups")
+            eda_chart("eda_16")
+            st.caption("🔎 Insight: Customers mostly cancel rides from busy pickup areas such as Vijayanagar, Tumkur Road, and Whitefield.")
+            error_caption(cust_cancel)
+
+            # 18. Incomplete Rides by Reason
+            eda_chart("eda_18")
+            st.caption("🔎 Insight: Incomplete rides mainly occur due to vehicle issues or ride cancellations by driver/customer.")
+
+    with places:
+        if places.open:
+            # 11. Top Pickup Locations
+            vc4 = eda("top_pickups")
+            eda_chart("eda_11")
+            st.caption("🔎 Insight: Vijayanagar, Tumkur Road, Whitefield, and Banashankari are the busiest pickup locations.")
+            error_caption(vc4)
+
+            # 12. Top Drop Locations
+            vc5 = eda("top_drops")
+            eda_chart("eda_12")
+            st.caption("🔎 Insight: Key drop locations mirror pickup hotspots, indicating concentrated ride demand in main city areas.")
+            error_caption(vc5)
+
+            # 19. Top Customers by Ride Count
+            top_cust = eda("top_customers")
+            eda_chart("eda_19")
+            st.caption("🔎 Insight: Most customers take few rides, while a small set of customers account for multiple bookings.")
+            error_caption(top_cust)
+
+
+
+
+# -----------------------
+# SQL QUERIES PAGE
+# -----------------------
+elif page == "SQL Queries":
+    st.header("🗄 SQL Queries Explorer")
+
+    queries = {
+        "1. Retrieve all successful bookings": """
+            SELECT * FROM rides WHERE "Booking_Status" = 'Success' LIMIT 10;
+        """,
+        "2. Average ride distance by vehicle type": """
+            SELECT "Vehicle_Type", AVG("Ride_Distance") AS avg_distance
+            FROM rides GROUP BY "Vehicle_Type";
+        """,
+        "3. Total cancelled rides by customers": """
+            SELECT COUNT(*) AS total_customer_cancellations
+            FROM rides WHERE "Booking_Status" = 'Canceled by Customer';
+        """,
+        "4. Top 5 customers by rides": """
+            SELECT "Customer_ID", COUNT(*) AS total_rides
+            FROM rides GROUP BY "Customer_ID"
+            ORDER BY total_rides DESC LIMIT 5;
+        """,
+        "5. Driver cancellations (personal & car issues)": """
+            SELECT COUNT(*) AS driver_cancellations_personal
+            FROM rides WHERE "Booking_Status" = 'Canceled by Driver'
+            AND "Canceled_Rides_by_Driver" = 'Personal & Car related issue';
+        """,
+        "6. Max & Min driver ratings for Prime Sedan": """
+            SELECT MAX("Driver_Ratings") AS max_rating, MIN("Driver_Ratings") AS min_rating
+            FROM rides WHERE "Vehicle_Type" = 'Prime Sedan' AND "Driver_Ratings" IS NOT NULL;
+        """,
+        "7. All rides paid with UPI": """
+            SELECT * FROM rides WHERE "Payment_Method" = 'UPI' LIMIT 10;
+        """,
+        "8. Average customer rating per vehicle type": """
+            SELECT "Vehicle_Type", AVG("Customer_Rating") AS avg_rating
+            FROM rides WHERE "Customer_Rating" IS NOT NULL
+            GROUP BY "Vehicle_Type";
+        """,
+        "9. Total booking value of successful rides": """
+            SELECT SUM("Booking_Value") AS total_success_value
+            FROM rides WHERE "Booking_Status" = 'Success';
+        """,
+        "10. Incomplete rides with reasons": """
+            SELECT Booking_ID, Incomplete_Rides, Incomplete_Rides_Reason
+            FROM rides WHERE Incomplete_Rides = 'Yes' LIMIT 10;
+        """
+    }
+
+    choice = st.selectbox("Select a query to run:", list(queries.keys()))
+    with profiler.span(choice, "sql"):
+        result = engine.query(queries[choice])
+
+    st.code(queries[choice], language="sql")
+    st.dataframe(result.frame, use_container_width=True)
+    st.caption(f"⏱ {result.seconds * 1000:.1f} ms" + (" (cached result)" if result.cached else ""))
+    with st.expander("Query plan"):
+        st.code(result.plan, language="text")
+
+
+# -----------------------
+# POWER BI DASHBOARD PAGE
+# -----------------------
+elif page == "Power BI Dashboard":
+    st.header("📊 Power BI Dashboard")
+    powerbi_url = "https://app.powerbi.com/view?r=eyJrIjoiYjdiZmVhOWMtYjY3Zi00Nzc0LWFlZWItN2Q0N2M2NjYyNDIzIiwidCI6ImZlM2I0ZGI2LWYzOGUtNDQ4Ni1hZTkwLTU3OGFmM2E1YTM4OCJ9"
+    st.markdown(
+        f'<iframe title="Ola Rides PowerBI" width="100%" height="800" src="{powerbi_url}" frameborder="0" allowFullScreen="true"></iframe>',
+        unsafe_allow_html=True
+    )
+
+
+# ==============================
+# 📊 INSIGHTS & RECOMMENDATIONS
+# ==============================
+elif page == "Insights & Recommendations":
+    st.title("📊 Insights & Recommendations")
+    st.image("images/ola-logo.png", width=120)
+
+    st.markdown("Here we combine **EDA findings + Power BI dashboard** into actionable insights.")
+    def insight(name):
+        return aggregate(INSIGHTS_AGGS, name, min_date, max_date)
+
+    def insight_chart(chart_id):
+        chart(INSIGHTS_FIGURES, chart_id, min_date, max_date, insight)
+
+    # ---- Layout: 10 Visuals with Insights ----
+    # Each visual is computed only once its expander is opened.
+    # 1. Booking Status Breakdown
+    section = st.expander("1. Booking Status Breakdown", expanded=True, key="ins_1", on_change="rerun")
+    with section:
+        if section.open:
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_1")
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - Out of **99,109 rides**, **62% were successful**; cancellations are **38%**.
+                - Cancellations: Driver ~17.7k, Customer ~10k, Driver Not Found ~9.7k.
+                - **High cancellation rate** indicates operational and demand-supply challenges.
+                """)
+
+
+    # 2. Cancellation Reasons by Driver
+    section = st.expander("2. Cancellation Reasons by Driver", key="ins_2", on_change="rerun")
+    with section:
+        if section.open:
+            driver_reasons = insight("driver_reasons")
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_2")
+                error_caption(driver_reasons)
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - Top reasons: **Personal/Car issues (6.2k)**, **Customer issues (5.2k)**, **Health (3.5k)**.
+                - Highlights need for **better driver support, backup fleet, and training**.
+                """)
+
+
+    # 3. Cancellation Reasons by Customer
+    section = st.expander("3. Cancellation Reasons by Customer", key="ins_3", on_change="rerun")
+    with section:
+        if section.open:
+            cust_reasons = insight("customer_reasons")
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_3")
+                error_caption(cust_reasons)
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - Main reasons: **Driver not moving (3k)**, **Driver asked to cancel (2.5k)**, **Change of plans (2k)**.
+                - Suggests **driver punctuality and communication** improvements are required.
+                """)
+
+
+    # 4. Revenue by Vehicle Type
+    section = st.expander("4. Revenue by Vehicle Type", key="ins_4", on_change="rerun")
+    with section:
+        if section.open:
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_4")
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - **Prime Sedan, eBike, Auto, Prime Plus** generate majority revenue.
+                - Premium vehicles have **higher fares**, while 2/3-wheelers contribute **high frequency rides**.
+                """)
+
+
+    # 5. Weekly Revenue Trends
+    section = st.expander("5. Weekly Revenue Trends", key="ins_5", on_change="rerun")
+    with section:
+        if section.open:
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_5")
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - Revenue is **stable across weeks (~12–13M/week)**.
+                - Week 31 shows a dip (**seasonality/holidays**).
+                - Indicates **stable demand with occasional fluctuations**.
+                """)
+
+
+    # 6. Distance vs Fare Scatter
+    section = st.expander("6. Distance vs Fare Scatter", key="ins_6", on_change="rerun")
+    with section:
+        if section.open:
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_6")
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - Correlation between distance and fare is **almost zero (0.0005)**.
+                - Pricing depends more on **vehicle type, surge pricing, and demand**, not distance alone.
+                """)
+
+
+    # 7. Top Pickup Locations (Cancellations)
+    section = st.expander("7. Top Pickup Locations (Cancellations)", key="ins_7", on_change="rerun")
+    with section:
+        if section.open:
+            cancel_pickups = insight("cancel_pickups")
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_7")
+                error_caption(cancel_pickups)
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - **Vijayanagar, Whitefield, Tumkur Road** are top cancellation hotspots.
+                - Indicates **supply-demand mismatch** in these areas during peak hours.
+                """)
+
+
+    # 8. Driver Ratings Distribution
+    section = st.expander("8. Driver Ratings Distribution", key="ins_8", on_change="rerun")
+    with section:
+        if section.open:
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_8")
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - Driver ratings are mostly around **4.0**.
+                - Service is **consistent**, but some drivers may require **performance support**.
+                """)
+
+
+    # 9. Customer Ratings Distribution
+    section = st.expander("9. Customer Ratings Distribution", key="ins_9", on_change="rerun")
+    with section:
+        if section.open:
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_9")
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - Customer ratings also center around **4.0**.
+                - Balanced ratings suggest **both driver and customer experience** can be improved.
+                """)
+
+
+    # 10. High Value Customers
+    section = st.expander("10. High Value Customers", key="ins_10", on_change="rerun")
+    with section:
+        if section.open:
+            high_value = insight("high_value_customers")
+            col1, col2 = st.columns([2, 3])
+            with col1:
+                insight_chart("ins_10")
+                error_caption(high_value, "₹{:,.0f}")
+            with col2:
+                st.subheader("Insights")
+                st.write("""
+                - A few **loyal customers contribute disproportionately** to revenue.
+                - Opportunity for **loyalty programs, personalized offers, and retention campaigns**.
+                """)
+
+
+    # ---- Embed Power BI Dashboard ----
+    st.subheader("Interactive Power BI Dashboard")
+    st.components.v1.iframe(
+        "https://app.powerbi.com/view?r=eyJrIjoiYjdiZmVhOWMtYjY3Zi00Nzc0LWFlZWItN2Q0N2M2NjYyNDIzIiwidCI6ImZlM2I0ZGI2LWYzOGUtNDQ4Ni1hZTkwLTU3OGFmM2E1YTM4OCJ9",
+        height=600,
+        width=1000
+    )
+
+    # ---- Recommendations Section ----
+    st.subheader("💡 Actionable Recommendations")
+    st.write("""
+    - **Reduce cancellations**:
+      - Improve driver availability and route compliance.
+      - Implement backup fleet support in high-demand zones.
+    - **Optimize vehicle allocation**:
+      - Focus premium vehicles on longer-distance rides to increase revenue.
+      - Assign frequent 2/3-wheelers to short-distance, high-demand zones.
+    - **Promote digital payments**:
+      - Encourage UPI/Credit Card usage to increase average booking value.
+    - **Customer retention**:
+      - Launch loyalty programs targeting high-value and repeat customers.
+      - Offer personalized promotions to top riders.
+    - **Driver performance & quality**:
+      - Conduct training and performance monitoring for low-rated drivers.
+      - Incentivize top drivers to maintain high service standards.
+    - **Demand forecasting & operational planning**:
+      - Monitor peak hours and high-demand locations for better supply planning.
+      - Adjust dynamic pricing or incentives based on ride volume patterns.
+    """)
+
+
+# -----------------------
+# Profiling Panel
+# -----------------------
+if PROFILE:
+    with st.sidebar.expander("🛠 Profiling"):
+        st.caption("This rerun. Charts served from the session cache show only their plotly_chart span.")
+        st.dataframe(profiler.frame(), hide_index=True)
+        st.caption(f"Data load of v{generation.number}")
+        st.dataframe(load_profile.frame(), hide_index=True)
+        st.download_button("Download Chrome trace", chrome_trace([load_profile, profiler]),
+                           file_name="ola-profile.json", mime="application/json")
+    if PROFILE_LOG:
+        profiler.log(PROFILE_LOG, page=page, data_version=generation.number)
@@ -0,0 +1,524 @@
+"""Columnar snapshot of the rides CSV.
+
+The CSV is parsed once into a directory of ``.npy`` files (one per column,
+string columns dictionary-encoded as categorical codes + categories) that
+can be memory-mapped on later loads.  The snapshot is rebuilt only when
+the CSV's size/mtime changes *and* its content hash differs.
+
+Rows are stored sorted by Date, so :class:`RideStore` can answer a date
+range with a per-day offset lookup and a zero-copy ``iloc`` slice.
+
+A one-part snapshot is mapped read-only, so every session and every app
+process on the host attaches to the same page-cache pages instead of
+holding its own copy; ``ingest.py`` compacts appended parts back into one
+segment.  Text columns stay mapped outside the DataFrame (pandas would
+otherwise turn them into a private per-process copy).
+
+    python data_store.py rides_no_outliers.csv   # compare old vs new load path
+"""
+import argparse
+import hashlib
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+SNAPSHOT_VERSION = 3
+
+# Low-cardinality columns that the dashboard groups and filters on.
+CATEGORICAL_COLUMNS = [
+    "Booking_Status", "Vehicle_Type", "Payment_Method", "Pickup_Location", "Drop_Location",
+    "Day_of_Week", "Canceled_Rides_by_Customer", "Canceled_Rides_by_Driver",
+    "Incomplete_Rides", "Incomplete_Rides_Reason",
+]
+
+# Unique per row: stored as fixed-width strings, since a dictionary would
+# be as large as the column and grow without bound on append.
+TEXT_COLUMNS = ["Booking_ID"]
+
+# Rows re-sorted per step when compacting parts that overlap in dates.
+COMPACT_CHUNK_ROWS = 1 << 20
+
+
+def default_snapshot_dir(csv_path):
+    root, _ = os.path.splitext(csv_path)
+    return root + ".snapshot"
+
+
+# -----------------------
+# Fingerprinting
+# -----------------------
+def _file_hash(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        for block in iter(lambda: fh.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _stat_key(path):
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _read_manifest(snapshot_dir):
+    try:
+        with open(os.path.join(snapshot_dir, "manifest.json")) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_manifest(snapshot_dir, manifest):
+    tmp = os.path.join(snapshot_dir, "manifest.json.tmp-%d" % os.getpid())
+    with open(tmp, "w") as fh:
+        json.dump(manifest, fh, indent=2)
+    os.replace(tmp, os.path.join(snapshot_dir, "manifest.json"))
+
+
+def snapshot_is_current(csv_path, snapshot_dir):
+    """True if ``snapshot_dir`` was built from the current contents of ``csv_path``.
+
+    A matching size/mtime is trusted as-is; otherwise the file is hashed so
+    that a ``touch`` or a byte-identical copy does not force a rebuild.
+    """
+    manifest = _read_manifest(snapshot_dir)
+    if manifest is None or manifest.get("version") != SNAPSHOT_VERSION:
+        return False
+    source = manifest["source"]
+    key = _stat_key(csv_path)
+    if key["size"] == source["size"] and key["mtime_ns"] == source["mtime_ns"]:
+        return True
+    if key["size"] != source["size"] or _file_hash(csv_path) != source["sha256"]:
+        return False
+    source.update(key)
+    _write_manifest(snapshot_dir, manifest)
+    return True
+
+
+# -----------------------
+# Build / Load
+# -----------------------
+def _codes_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _column_specs(df):
+    columns = []
+    for name in df.columns:
+        col = df[name]
+        if name in TEXT_COLUMNS:
+            kind = "text"
+        elif name in CATEGORICAL_COLUMNS or col.dtype == object or pd.api.types.is_string_dtype(col):
+            kind = "category"
+        elif pd.api.types.is_datetime64_any_dtype(col):
+            kind = "datetime"
+        else:
+            kind = "numeric"
+        columns.append({"name": name, "kind": kind})
+    return columns
+
+
+def _encode_frame(df, columns, categories):
+    """Arrays to write for one part of ``df``.
+
+    ``categories`` maps each categorical column to its label array and is
+    extended in place: new labels are appended, so codes already written
+    by earlier parts stay valid.
+    """
+    arrays = {}
+    for spec in columns:
+        name, kind = spec["name"], spec["kind"]
+        col = df[name]
+        if kind == "category":
+            known = categories.get(name, np.array([], dtype=str))
+            labels = col.astype(str).where(col.notna())
+            new = pd.Index(labels.dropna().unique()).difference(pd.Index(known))
+            if len(new):
+                known = np.concatenate([known, new.to_numpy(dtype=str)])
+                categories[name] = known
+            categories.setdefault(name, known)
+            codes = pd.Index(known).get_indexer(labels)
+            arrays[name + ".codes"] = codes.astype(_codes_dtype(len(known)))
+        elif kind == "text":
+            arrays[name] = col.fillna("").astype(str).to_numpy(dtype=str)
+        elif kind == "datetime":
+            arrays[name] = pd.to_datetime(col).to_numpy(dtype="datetime64[ns]")
+        else:
+            if pd.api.types.is_integer_dtype(col):
+                col = pd.to_numeric(col, downcast="integer")
+            arrays[name] = pd.to_numeric(col).to_numpy()
+    return arrays
+
+
+def _write_part(snapshot_dir, part, arrays):
+    part_dir = os.path.join(snapshot_dir, part)
+    os.makedirs(part_dir, exist_ok=True)
+    for key, arr in arrays.items():
+        np.save(os.path.join(part_dir, key + ".npy"), arr, allow_pickle=False)
+
+
+def _write_categories(snapshot_dir, categories):
+    for name, labels in categories.items():
+        tmp = os.path.join(snapshot_dir, name + ".categories.tmp.npy")
+        np.save(tmp, labels, allow_pickle=False)
+        os.replace(tmp, os.path.join(snapshot_dir, name + ".categories.npy"))
+
+
+def _read_categories(snapshot_dir, manifest):
+    return {spec["name"]: np.load(os.path.join(snapshot_dir, spec["name"] + ".categories.npy"))
+            for spec in manifest["columns"] if spec["kind"] == "category"}
+
+
+def write_snapshot(df, snapshot_dir, source):
+    """Write ``df`` as a one-part snapshot, atomically (build aside, then swap)."""
+    columns, categories = _column_specs(df), {}
+    arrays = _encode_frame(df, columns, categories)
+    tmp_dir = "%s.tmp-%d" % (snapshot_dir, os.getpid())
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+    os.makedirs(tmp_dir)
+    _write_part(tmp_dir, "part-00000", arrays)
+    _write_categories(tmp_dir, categories)
+    _write_manifest(tmp_dir, {
+        "version": SNAPSHOT_VERSION,
+        "rows": len(df),
+        "columns": columns,
+        "parts": [{"name": "part-00000", "rows": len(df)}],
+        "source": source,
+    })
+    old_dir = snapshot_dir + ".old"
+    shutil.rmtree(old_dir, ignore_errors=True)
+    if os.path.exists(snapshot_dir):
+        os.replace(snapshot_dir, old_dir)
+    os.replace(tmp_dir, snapshot_dir)
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+def _next_part(manifest):
+    # Part names only ever increase, so a compacted part never reuses the
+    # name of one that a reader may still have mapped.
+    return "part-%05d" % (max(int(p["name"].split("-")[1]) for p in manifest["parts"]) + 1)
+
+
+def append_snapshot(df, snapshot_dir, **state):
+    """Append ``df`` as a new part; ``state`` is merged into the manifest.
+
+    An empty ``df`` only updates the state of an existing snapshot.
+
+    The part and the extended category files are written first and the
+    manifest last, so readers only ever see fully written parts.
+    """
+    manifest = _read_manifest(snapshot_dir)
+    if manifest is None:
+        write_snapshot(df, snapshot_dir, {"kind": "ingest"})
+        manifest = _read_manifest(snapshot_dir)
+    elif len(df):
+        categories = _read_categories(snapshot_dir, manifest)
+        arrays = _encode_frame(df, manifest["columns"], categories)
+        part = _next_part(manifest)
+        _write_part(snapshot_dir, part, arrays)
+        _write_categories(snapshot_dir, categories)
+        manifest["parts"].append({"name": part, "rows": len(df)})
+        manifest["rows"] += len(df)
+    manifest.update(state)
+    _write_manifest(snapshot_dir, manifest)
+    return manifest
+
+
+def build_snapshot(csv_path, snapshot_dir=None):
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+    source = dict(_stat_key(csv_path), path=os.path.abspath(csv_path), sha256=_file_hash(csv_path))
+    df = pd.read_csv(csv_path, parse_dates=["Date"])
+    df = df.sort_values("Date", kind="stable", ignore_index=True)
+    write_snapshot(df, snapshot_dir, source)
+    return snapshot_dir
+
+
+def _open_manifest(snapshot_dir):
+    manifest = _read_manifest(snapshot_dir)
+    if manifest is None:
+        raise FileNotFoundError("no snapshot manifest in %s" % snapshot_dir)
+    return manifest
+
+
+def _column_reader(snapshot_dir, manifest, mmap):
+    mode = "r" if mmap else None
+    parts = [os.path.join(snapshot_dir, p["name"]) for p in manifest["parts"]]
+
+    def column(key):
+        arrays = [np.load(os.path.join(part, key + ".npy"), mmap_mode=mode) for part in parts]
+        return arrays[0] if len(arrays) == 1 else np.concatenate(arrays)
+    return column
+
+
+def _array_keys(manifest):
+    return [spec["name"] + ".codes" if spec["kind"] == "category" else spec["name"]
+            for spec in manifest["columns"]]
+
+
+def read_snapshot(snapshot_dir, mmap=True, text=True):
+    """Load a snapshot directory into a DataFrame.
+
+    A single-part snapshot is memory-mapped (read-only, zero-copy); parts
+    of a multi-part (appended) snapshot are concatenated.  ``text=False``
+    leaves out the text columns, see :func:`read_text_columns`.
+    """
+    manifest = _open_manifest(snapshot_dir)
+    column = _column_reader(snapshot_dir, manifest, mmap)
+    categories = _read_categories(snapshot_dir, manifest)
+    data = {}
+    for spec in manifest["columns"]:
+        name = spec["name"]
+        if spec["kind"] == "category":
+            data[name] = pd.Categorical.from_codes(column(name + ".codes"), categories=categories[name])
+        elif spec["kind"] != "text" or text:
+            data[name] = column(name)
+    return pd.DataFrame(data, copy=False)
+
+
+def read_text_columns(snapshot_dir, mmap=True):
+    """Text columns as fixed-width numpy string arrays, row-aligned with :func:`read_snapshot`."""
+    manifest = _open_manifest(snapshot_dir)
+    column = _column_reader(snapshot_dir, manifest, mmap)
+    return {spec["name"]: column(spec["name"]) for spec in manifest["columns"] if spec["kind"] == "text"}
+
+
+def _in_date_order(dates):
+    """Whether the concatenated ``dates`` (one array per part) are already sorted by day."""
+    last = None
+    for part in dates:
+        days = _day_numbers(part)
+        if len(days) and ((last is not None and days[0] < last) or (days[1:] < days[:-1]).any()):
+            return False
+        last = days[-1] if len(days) else last
+    return True
+
+
+def _gather(arrays, starts, index, out):
+    """``out[:] = concatenate(arrays)[index]`` without concatenating."""
+    which = np.searchsorted(starts, index, side="right") - 1
+    for i, arr in enumerate(arrays):
+        hit = which == i
+        if hit.any():
+            out[hit] = arr[index[hit] - starts[i]]
+
+
+def compact_snapshot(snapshot_dir, chunk_rows=COMPACT_CHUNK_ROWS):
+    """Merge the parts of an appended snapshot into one Date-sorted part.
+
+    Afterwards the snapshot is a single segment that :func:`read_snapshot`
+    maps without copying.  Each column is written straight into a mapped
+    ``.npy`` one part (or, when the parts overlap in dates and must be
+    re-sorted, one chunk of rows) at a time, so memory stays bounded by a
+    part rather than the whole history; only the sort order of an
+    overlapping snapshot is held in full.  The old parts are removed only
+    after the manifest points at the new one.  Returns True if the
+    snapshot was rewritten.
+    """
+    manifest = _read_manifest(snapshot_dir)
+    if manifest is None or len(manifest["parts"]) < 2:
+        return False
+    paths = [os.path.join(snapshot_dir, p["name"]) for p in manifest["parts"]]
+    load = lambda key: [np.load(os.path.join(path, key + ".npy"), mmap_mode="r") for path in paths]
+    # Appends of later days are usually already in order and are copied as-is.
+    dates = load("Date")
+    order = None
+    if not _in_date_order(dates):
+        order = np.argsort(np.concatenate([_day_numbers(d) for d in dates]), kind="stable")
+    starts = np.cumsum([0] + [len(d) for d in dates])
+    part = _next_part(manifest)
+    part_dir = os.path.join(snapshot_dir, part)
+    os.makedirs(part_dir, exist_ok=True)
+    for key in _array_keys(manifest):
+        arrays = load(key)
+        # Parts may differ in code width or string length; take the widest.
+        out = np.lib.format.open_memmap(os.path.join(part_dir, key + ".npy"), mode="w+",
+                                        dtype=np.result_type(*arrays), shape=(int(starts[-1]),))
+        if order is None:
+            for arr, lo in zip(arrays, starts):
+                out[lo:lo + len(arr)] = arr
+        else:
+            for lo in range(0, len(order), chunk_rows):
+                _gather(arrays, starts, order[lo:lo + chunk_rows], out[lo:lo + chunk_rows])
+        out.flush()
+        del out, arrays
+    old = [p["name"] for p in manifest["parts"]]
+    manifest["parts"] = [{"name": part, "rows": manifest["rows"]}]
+    _write_manifest(snapshot_dir, manifest)
+    for name in old:
+        shutil.rmtree(os.path.join(snapshot_dir, name), ignore_errors=True)
+    return True
+
+
+def snapshot_is_ingested(snapshot_dir):
+    """True if the snapshot is maintained by ``ingest.py`` rather than built from a CSV."""
+    manifest = _read_manifest(snapshot_dir)
+    return manifest is not None and manifest["source"].get("kind") == "ingest"
+
+
+def load_rides(csv_path, snapshot_dir=None):
+    """Return a :class:`RideStore`, (re)building the snapshot only if the CSV changed.
+
+    A snapshot written by ``ingest.py`` is authoritative and used as-is.
+    """
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+    if not snapshot_is_ingested(snapshot_dir) and not snapshot_is_current(csv_path, snapshot_dir):
+        build_snapshot(csv_path, snapshot_dir)
+    try:
+        return RideStore(read_snapshot(snapshot_dir, text=False), read_text_columns(snapshot_dir))
+    except FileNotFoundError:
+        # An ingest run compacted the parts we were about to map; the
+        # manifest now names the new part.
+        return RideStore(read_snapshot(snapshot_dir, text=False), read_text_columns(snapshot_dir))
+
+
+def data_version(csv_path, snapshot_dir=None):
+    """Cache key that changes when the CSV or an ingested snapshot changes."""
+    snapshot_dir = snapshot_dir or default_snapshot_dir(csv_path)
+    key = []
+    for path in (csv_path, os.path.join(snapshot_dir, "manifest.json")):
+        try:
+            key.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            key.append(0)
+    return tuple(key)
+
+
+# -----------------------
+# Date Index
+# -----------------------
+def _day_numbers(dates):
+    return np.asarray(dates, dtype="datetime64[ns]").astype("datetime64[D]").view("int64")
+
+
+class RideStore:
+    """Rides frame sorted by Date with a per-day row offset index.
+
+    ``day_offsets[i]`` is the first row whose Date is ``first_day + i``, so
+    the rows of any inclusive date range are ``day_offsets[a]:day_offsets[b + 1]``.
+
+    ``text`` holds row-aligned arrays for columns kept out of ``df``
+    (see :func:`read_text_columns`).
+    """
+
+    def __init__(self, df, text=None):
+        text = dict(text or {})
+        days = _day_numbers(df["Date"])
+        if len(days) and np.any(days[1:] < days[:-1]):
+            order = np.argsort(days, kind="stable")
+            df = df.iloc[order].reset_index(drop=True)
+            text = {name: values[order] for name, values in text.items()}
+            days = days[order]
+        self.df = df
+        self.text = text
+        self.first_day = int(days[0]) if len(days) else 0
+        n_days = int(days[-1]) - self.first_day + 1 if len(days) else 0
+        self.day_offsets = np.searchsorted(days, self.first_day + np.arange(n_days + 1))
+
+    def __len__(self):
+        return len(self.df)
+
+    @property
+    def n_days(self):
+        return len(self.day_offsets) - 1
+
+    @property
+    def min_date(self):
+        return self.df["Date"].iloc[0]
+
+    @property
+    def max_date(self):
+        return self.df["Date"].iloc[-1]
+
+    def day_index(self, start, end):
+        """Half-open ``(lo, hi)`` day positions covering ``start..end`` inclusive."""
+        lo = int(_day_numbers([pd.Timestamp(start)])[0]) - self.first_day
+        hi = int(_day_numbers([pd.Timestamp(end)])[0]) - self.first_day + 1
+        lo = min(max(lo, 0), self.n_days)
+        hi = min(max(hi, lo), self.n_days)
+        return lo, hi
+
+    def row_range(self, start, end):
+        lo, hi = self.day_index(start, end)
+        return int(self.day_offsets[lo]), int(self.day_offsets[hi])
+
+    def filter_by_dates(self, start, end):
+        """Rows with ``start <= Date <= end`` as a slice of the sorted frame."""
+        lo, hi = self.row_range(start, end)
+        return self.df.iloc[lo:hi]
+
+
+# -----------------------
+# Load time / memory report
+# -----------------------
+def _rss_mb():
+    # Current RSS from /proc where available, peak RSS otherwise.
+    try:
+        with open("/proc/self/statm") as fh:
+            return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _private_mb():
+    # Anonymous (heap) memory: what each worker pays on its own.  Mapped
+    # snapshot pages are file-backed and shared through the page cache.
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            fields = dict(line.split(":", 1) for line in fh if ":" in line)
+        return int(fields["Anonymous"].split()[0]) / 1024
+    except (OSError, KeyError):
+        return float("nan")
+
+
+def _measure(mode, csv_path):
+    before, private_before = _rss_mb(), _private_mb()
+    start = time.perf_counter()
+    if mode == "csv":
+        df = pd.read_csv(csv_path, parse_dates=["Date"])
+    else:
+        df = load_rides(csv_path).df
+    # Read a byte of every page of every column, so all memory-mapped pages
+    # are faulted in and counted, as a full scan by the app would.
+    page = resource.getpagesize()
+    for name in df.columns:
+        col = df[name]
+        values = col.cat.codes.to_numpy() if isinstance(col.dtype, pd.CategoricalDtype) else col.to_numpy()
+        if values.dtype != object:
+            np.ascontiguousarray(values).reshape(-1).view(np.uint8)[::page].sum()
+    elapsed = time.perf_counter() - start
+    print(json.dumps({
+        "mode": mode,
+        "rows": len(df),
+        "seconds": round(elapsed, 4),
+        "rss_mb": round(_rss_mb() - before, 1),
+        "private_mb": round(_private_mb() - private_before, 1),
+        "frame_mb": round(df.memory_usage(deep=True).sum() / 2**20, 1),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare CSV vs snapshot load paths.")
+    parser.add_argument("csv_path")
+    parser.add_argument("--mode", choices=["csv", "snapshot"])
+    args = parser.parse_args()
+    if args.mode:
+        _measure(args.mode, args.csv_path)
+        return
+    # Warm the snapshot, then measure each path in a fresh interpreter.
+    load_rides(args.csv_path)
+    for mode in ("csv", "snapshot"):
+        subprocess.run([sys.executable, __file__, args.csv_path, "--mode", mode], check=True)
+
+
+if __name__ == "__main__":
+    main()
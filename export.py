@@ -0,0 +1,207 @@
+"""Batch export of the dashboard for many date ranges, without Streamlit.
+
+Each report holds the Home KPIs, the EDA charts and the Insights charts
+(see charts.py) over one date range, as a single HTML file or a directory
+of PNGs (PNG needs the kaleido package).  Unlike the app, whose Insights
+page always covers all the data, a report draws its Insights charts over
+its own range too.
+
+The rides are loaded and the per-day indexes precomputed once, in this
+process; the ranges are then spread over a pool of forked workers that
+inherit that dataset, so each report costs only its aggregations and
+figures.  Each worker runs every aggregation of a page in one fused pass
+(:meth:`backends.PandasBackend.run`).  With ``--backend sqlite`` each
+worker opens its own connections to the database instead.
+
+    python export.py --weekly --monthly --ytd --out reports
+    python export.py --range 2024-07-01 2024-07-14 --format png --workers 4
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+import plotly.graph_objects as go
+import plotly.offline
+
+from backends import BACKENDS, PandasBackend, SQLiteBackend
+from charts import EDA_FIGURES, INSIGHTS_FIGURES
+from data_store import default_snapshot_dir, load_rides
+from fused import EDA_AGGS, INSIGHTS_AGGS
+from precompute import Precompute
+from sql_engine import QueryEngine, prepare_database
+
+CSV_PATH = "rides_no_outliers.csv"
+DB_PATH = "ola_rides.db"
+# Forked, so the workers inherit the loaded dataset: unlike the app, this
+# script has no other threads running when the pool starts.
+_MP_CONTEXT = multiprocessing.get_context(
+    "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+
+KPI_ROWS = [
+    ("Total Rides", "total_rides", "{:,}"),
+    ("Successful Rides", "successful_rides", "{:,}"),
+    ("Success Rate", "success_rate", "{:.2f}%"),
+    ("Total Cancellations", "total_cancellations", "{:,}"),
+    ("Cancellation Rate", "cancel_rate", "{:.2f}%"),
+    ("Avg Fare (Success)", "avg_fare", "₹{:.2f}"),
+    ("Median Fare (Success)", "median_fare", "₹{:.1f}"),
+    ("Avg Distance (Success)", "avg_distance", "{:.2f} km"),
+    ("Avg Driver Rating", "avg_driver_rating", "{:.1f}"),
+    ("Avg Customer Rating", "avg_customer_rating", "{:.1f}"),
+]
+
+
+# -----------------------
+# Date Ranges
+# -----------------------
+def weekly_ranges(first, last):
+    """``(label, start, end)`` per Monday-to-Sunday week, clipped to ``first..last``."""
+    out = []
+    for monday in pd.date_range(first - pd.Timedelta(days=first.weekday()), last, freq="7D"):
+        year, week, _ = monday.isocalendar()
+        out.append((f"week-{year}-W{week:02d}", max(monday, first), min(monday + pd.Timedelta(days=6), last)))
+    return out
+
+
+def monthly_ranges(first, last):
+    return [(f"month-{month:%Y-%m}", max(month, first), min(month + pd.offsets.MonthEnd(0), last))
+            for month in pd.date_range(first.replace(day=1), last, freq="MS")]
+
+
+def ytd_range(first, last):
+    return [(f"ytd-{last.year}", max(pd.Timestamp(last.year, 1, 1), first), last)]
+
+
+# -----------------------
+# Data
+# -----------------------
+def load_backend(kind, csv_path=CSV_PATH, db_path=DB_PATH, workers=None):
+    """The app's backend, with its indexes precomputed, but without sidebar filters."""
+    if kind == "sqlite":
+        prepare_database(db_path)
+        return SQLiteBackend(QueryEngine(db_path))
+    store = load_rides(csv_path)
+    idx = Precompute(dict(EDA_AGGS, **INSIGHTS_AGGS), workers=workers).run(store, default_snapshot_dir(csv_path))
+    return PandasBackend(store, idx.kpis, idx.dists, idx.cube, idx.topk)
+
+
+_backend = None
+
+
+def _init_worker(kind, csv_path, db_path):
+    # Forked workers inherit the parent's in-memory backend; SQLite connections
+    # (and spawned workers) are opened per process.
+    global _backend
+    if _backend is None:
+        _backend = load_backend(kind, csv_path, db_path, workers=1)
+
+
+# -----------------------
+# Reports
+# -----------------------
+def kpi_figure(k, title):
+    return go.Figure(go.Table(
+        header={"values": ["KPI", "Value"], "align": "left"},
+        cells={"values": [[label for label, _, _ in KPI_ROWS], [fmt.format(k[key]) for _, key, fmt in KPI_ROWS]],
+               "align": "left"},
+    )).update_layout(title=title)
+
+
+def report_figures(backend, start, end):
+    """``[(name, figure)]`` of one report: KPIs, then the EDA and Insights charts in page order."""
+    figures = [("kpis", kpi_figure(backend.kpi_summary(start, end), f"KPIs {start:%Y-%m-%d} to {end:%Y-%m-%d}"))]
+    for aggs, builders in ((EDA_AGGS, EDA_FIGURES), (INSIGHTS_AGGS, INSIGHTS_FIGURES)):
+        frames = backend.run(aggs, start, end)
+        figures += [(chart_id, build(backend, start, end, frames.__getitem__)) for chart_id, build in builders.items()]
+    return figures
+
+
+def write_report(figures, out_dir, label, fmt):
+    if fmt == "png":
+        path = os.path.join(out_dir, label)
+        os.makedirs(path, exist_ok=True)
+        for name, fig in figures:
+            fig.write_image(os.path.join(path, name + ".png"))
+        return path
+    path = os.path.join(out_dir, label + ".html")
+    # plotly.min.js is written once next to the reports, so each file stays small.
+    body = "\n".join(fig.to_html(full_html=False, include_plotlyjs="directory" if i == 0 else False)
+                     for i, (_, fig) in enumerate(figures))
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(f"<!DOCTYPE html>\n<html><head><meta charset=\"utf-8\"><title>Ola Rides {label}</title></head>"
+                 f"<body>\n<h1>Ola Rides Analysis: {label}</h1>\n{body}\n</body></html>\n")
+    return path
+
+
+def export_range(label, start, end, out_dir, fmt):
+    """Render and write one report; returns ``(label, path, seconds)``."""
+    started = time.perf_counter()
+    path = write_report(report_figures(_backend, start, end), out_dir, label, fmt)
+    return label, path, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--weekly", action="store_true", help="one report per Monday-to-Sunday week")
+    parser.add_argument("--monthly", action="store_true", help="one report per calendar month")
+    parser.add_argument("--ytd", action="store_true", help="one year-to-date report")
+    parser.add_argument("--range", nargs=2, action="append", default=[], metavar=("START", "END"),
+                        help="an inclusive date range (repeatable)")
+    parser.add_argument("--out", default="reports")
+    parser.add_argument("--format", choices=["html", "png"], default="html")
+    parser.add_argument("--backend", choices=BACKENDS, default=os.environ.get("OLA_BACKEND", "pandas"))
+    parser.add_argument("--csv", default=CSV_PATH)
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+    if args.format == "png":
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error("--format png needs the kaleido package (pip install kaleido)")
+
+    global _backend
+    log = lambda msg: print(msg, file=sys.stderr)
+    started = time.perf_counter()
+    if args.backend == "pandas":
+        _backend = load_backend("pandas", args.csv, args.db, args.workers)
+    else:
+        # Only used here for the date bounds; workers open their own connections.
+        _init_worker("sqlite", args.csv, args.db)
+    first, last = (pd.Timestamp(d).normalize() for d in _backend.date_bounds())
+    log(f"loaded {args.backend} data ({first:%Y-%m-%d} to {last:%Y-%m-%d}) in {time.perf_counter() - started:.1f}s")
+
+    ranges = [(f"range-{a}-{b}", pd.Timestamp(a), pd.Timestamp(b)) for a, b in args.range]
+    if args.weekly:
+        ranges += weekly_ranges(first, last)
+    if args.monthly:
+        ranges += monthly_ranges(first, last)
+    if args.ytd or not ranges:
+        ranges += ytd_range(first, last)
+
+    os.makedirs(args.out, exist_ok=True)
+    if args.format == "html":
+        with open(os.path.join(args.out, "plotly.min.js"), "w", encoding="utf-8") as fh:
+            fh.write(plotly.offline.get_plotlyjs())
+
+    started = time.perf_counter()
+    tasks = [(label, start, end, args.out, args.format) for label, start, end in ranges]
+    if args.workers > 1 and len(tasks) > 1:
+        if args.backend == "sqlite":
+            _backend = None
+        with ProcessPoolExecutor(min(args.workers, len(tasks)), mp_context=_MP_CONTEXT,
+                                 initializer=_init_worker, initargs=(args.backend, args.csv, args.db)) as pool:
+            results = list(pool.map(export_range, *zip(*tasks)))
+    else:
+        results = [export_range(*task) for task in tasks]
+    for label, path, seconds in results:
+        log(f"{path} ({seconds:.2f}s)")
+    log(f"{len(results)} reports in {time.perf_counter() - started:.1f}s with {args.workers} workers")
+
+
+if __name__ == "__main__":
+    main()
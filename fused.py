@@ -0,0 +1,196 @@
+"""Fused, declarative aggregation over integer-coded columns.
+
+A page declares the aggregations it needs as ``{name: Agg}``; :func:`run`
+decodes each group-by column, filter column and measure once, and answers
+all aggregations that share a ``(by, where column)`` pair from a single
+``np.bincount`` over a composite code, instead of a separate
+``value_counts``/``groupby`` pass per chart.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+# by:    group-by column
+# stat:  "count", "sum" or "mean"
+# value: measure column for sum / mean
+# where: optional (column, "eq" | "contains", label) row filter
+# top:   keep only the ``top`` largest groups
+# sort:  "value" (largest first) or "key"; defaults to "value" for counts and
+#        top-k (like ``value_counts``), "key" otherwise (like ``groupby``)
+Agg = namedtuple("Agg", ["by", "stat", "value", "where", "top", "sort"],
+                 defaults=("count", None, None, None, None))
+
+
+def sort_order(agg):
+    if agg.sort is not None:
+        return agg.sort
+    return "value" if agg.top is not None or agg.stat == "count" else "key"
+
+
+def result_column(agg):
+    return "count" if agg.stat == "count" else agg.value
+
+
+def _codes(df, column, cache):
+    """``(codes, labels)`` with codes as intp shifted by one (slot 0 = NaN)."""
+    if column not in cache:
+        col = df[column]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            codes, labels = col.cat.codes.to_numpy(), col.cat.categories
+        elif pd.api.types.is_datetime64_any_dtype(col) or pd.api.types.is_integer_dtype(col):
+            # Dates and small ints (hour, week) code as offsets from the minimum.
+            is_date = pd.api.types.is_datetime64_any_dtype(col)
+            values = col.to_numpy()
+            values = values.astype("datetime64[D]").view("int64") if is_date else values.astype("int64")
+            base = int(values.min()) if len(values) else 0
+            labels = base + np.arange(int(values.max()) - base + 1 if len(values) else 0)
+            labels = pd.to_datetime(labels, unit="D") if is_date else pd.Index(labels)
+            codes = values - base
+        else:
+            codes, labels = pd.factorize(col, sort=True)
+            labels = pd.Index(labels)
+        cache[column] = (codes.astype(np.intp) + 1, labels)
+    return cache[column]
+
+
+def _values(df, column, cache):
+    if column not in cache:
+        values = df[column].to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        cache[column] = (np.where(valid, values, 0.0), None if valid.all() else valid.astype(float))
+    return cache[column]
+
+
+def _plan(aggs):
+    """Group aggregations by ``(by, where column)``; one composite key per group.
+
+    Unfiltered aggregations ride along with a filtered group on the same
+    ``by`` column, since they are just the sum over every filter value.
+    """
+    groups = {}
+    for name, agg in aggs.items():
+        groups.setdefault((agg.by, agg.where[0] if agg.where else None), []).append(name)
+    for by, wcol in [key for key in groups if key[1] is None]:
+        host = next((key for key in groups if key[0] == by and key[1] is not None), None)
+        if host is not None:
+            groups[host] += groups.pop((by, None))
+    return groups
+
+
+def _where_slots(where, labels):
+    """Boolean selector over the filter column's slots (slot 0 = NaN)."""
+    if where is None:
+        return slice(None)
+    _, op, label = where
+    labels = labels.astype(str)
+    hit = labels == label if op == "eq" else np.asarray(labels.str.contains(label))
+    return np.concatenate([[False], hit])
+
+
+def _by_value(values, labels, top=None):
+    """Positions of ``values``, largest first and ties by label, cut to ``top``.
+
+    The order SQLite gives with ``ORDER BY v DESC, k``, so both backends
+    agree on which tied keys make a top-k cut and in what order.
+    """
+    idx = np.arange(len(values))
+    if top is not None and len(idx) > top:
+        # Everything at least as large as the top-th value, ties at the cut included.
+        idx = idx[values >= np.partition(values, len(idx) - top)[len(idx) - top]]
+    idx = idx[np.argsort(np.asarray(labels[idx]), kind="stable")]
+    return idx[np.argsort(-values[idx], kind="stable")][:top]
+
+
+def _finish(agg, labels, result, present):
+    idx = np.flatnonzero(present)
+    if agg.top is not None or sort_order(agg) == "value":
+        idx = idx[_by_value(result[idx], labels[idx], agg.top)]
+    if sort_order(agg) == "key":
+        # Category labels are in first-seen order, not sorted.
+        idx = idx[np.argsort(np.asarray(labels[idx]), kind="stable")]
+    return pd.DataFrame({agg.by: labels[idx], result_column(agg): result[idx]})
+
+
+def _run_group(df, by, wcol, names, aggs, codes_cache, value_cache):
+    by_codes, by_labels = _codes(df, by, codes_cache)
+    if wcol is None:
+        key, w_labels, width = by_codes, None, 1
+    else:
+        w_codes, w_labels = _codes(df, wcol, codes_cache)
+        width = len(w_labels) + 1
+        key = by_codes * width + w_codes
+    shape = (len(by_labels) + 1, width)
+    size = shape[0] * shape[1]
+
+    def table(weights=None):
+        return np.bincount(key, weights=weights, minlength=size).reshape(shape)
+
+    counts = table()
+    sums, valid_n = {}, {}
+    for name in names:
+        agg = aggs[name]
+        if agg.stat != "count" and agg.value not in sums:
+            values, valid = _values(df, agg.value, value_cache)
+            sums[agg.value] = table(values)
+            valid_n[agg.value] = counts if valid is None else table(valid)
+
+    out = {}
+    for name in names:
+        agg = aggs[name]
+        sel = _where_slots(agg.where, w_labels)
+        n = counts[1:, sel].sum(axis=1)
+        if agg.stat == "count":
+            result, present = n, n > 0
+        else:
+            total = sums[agg.value][1:, sel].sum(axis=1)
+            if agg.stat == "sum":
+                result, present = total, n > 0
+            else:
+                nv = valid_n[agg.value][1:, sel].sum(axis=1)
+                present = nv > 0
+                result = np.divide(total, nv, out=np.zeros(len(nv)), where=present)
+        out[name] = _finish(agg, by_labels, result, present)
+    return out
+
+
+def run(df, aggs):
+    """Evaluate ``{name: Agg}`` over ``df``; returns ``{name: DataFrame}``."""
+    codes_cache, value_cache, out = {}, {}, {}
+    for (by, wcol), names in _plan(aggs).items():
+        out.update(_run_group(df, by, wcol, names, aggs, codes_cache, value_cache))
+    return {name: out[name] for name in aggs}
+
+
+# -----------------------
+# Page Declarations
+# -----------------------
+CANCELED = ("Booking_Status", "contains", "Canceled")
+
+EDA_AGGS = {
+    "vehicle": Agg("Vehicle_Type"),
+    "daily_rides": Agg("Date", sort="key"),
+    "payment": Agg("Payment_Method"),
+    "weekday": Agg("Day_of_Week"),
+    "hour": Agg("Ride_Hour", sort="key"),
+    "daily_cancellations": Agg("Date", where=CANCELED, sort="key"),
+    "daily_value": Agg("Date", "sum", "Booking_Value"),
+    "avg_distance": Agg("Vehicle_Type", "mean", "Ride_Distance"),
+    "avg_rating": Agg("Vehicle_Type", "mean", "Customer_Rating"),
+    "avg_payment_value": Agg("Payment_Method", "mean", "Booking_Value"),
+    "top_pickups": Agg("Pickup_Location", top=10),
+    "top_drops": Agg("Drop_Location", top=10),
+    "customer_cancel_pickups": Agg("Pickup_Location", where=("Booking_Status", "eq", "Canceled by Customer"), top=10),
+    "incomplete_reasons": Agg("Incomplete_Rides_Reason", where=("Incomplete_Rides", "eq", "Yes")),
+    "top_customers": Agg("Customer_ID", top=10),
+}
+
+INSIGHTS_AGGS = {
+    "status": Agg("Booking_Status"),
+    "driver_reasons": Agg("Canceled_Rides_by_Driver", top=5),
+    "customer_reasons": Agg("Canceled_Rides_by_Customer", top=5),
+    "revenue_by_vehicle": Agg("Vehicle_Type", "sum", "Booking_Value"),
+    "weekly_revenue": Agg("Ride_Week", "sum", "Booking_Value"),
+    "cancel_pickups": Agg("Pickup_Location", where=CANCELED, top=10),
+    "high_value_customers": Agg("Customer_ID", "sum", "Booking_Value", top=10),
+}
@@ -0,0 +1,282 @@
+"""Stream a raw rides CSV into ola_rides.db and the columnar snapshot.
+
+Two passes over the file, each in fixed-size chunks so memory stays bounded
+whatever the file size:
+
+1. a log-bucket sketch of Booking_Value and Ride_Distance gives the IQR
+   outlier fences;
+2. each chunk is cleaned, outlier-filtered, given Ride_Hour / Ride_Week /
+   Day_of_Week, de-duplicated against the ``rides`` table and written to
+   the snapshot (as a new part) and SQLite (one ``executemany`` transaction).
+
+Progress is recorded per source file in both sinks, so an interrupted run
+resumes where it stopped and re-running on a grown file (new days
+appended) only ingests the new rows.  At the end of a run the new parts
+are compacted into one Date-sorted segment that app processes map
+read-only and share.
+
+    python ingest.py raw_rides.csv --db ola_rides.db --snapshot rides_no_outliers.snapshot
+"""
+import argparse
+import os
+import sqlite3
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from data_store import _read_manifest, append_snapshot, compact_snapshot, read_text_columns
+from sketches import LogBuckets, quantiles
+from sql_engine import prepare_database
+
+DB_PATH = "ola_rides.db"
+SNAPSHOT_PATH = "rides_no_outliers.snapshot"
+
+NULL_VALUES = ["null", "NULL", "None", "NaN", "nan", "N/A", ""]
+DROP_COLUMNS = ["Vehicle Images", "Unnamed: 0"]
+NUMERIC_COLUMNS = ["V_TAT", "C_TAT", "Booking_Value", "Ride_Distance", "Driver_Ratings", "Customer_Rating"]
+RATING_COLUMNS = ["Driver_Ratings", "Customer_Rating"]
+# Columns with IQR outlier removal; Ride_Distance fences use positive
+# values only, since canceled rides have a distance of 0.
+OUTLIER_COLUMNS = {"Booking_Value": False, "Ride_Distance": True}
+
+
+# -----------------------
+# Cleaning
+# -----------------------
+def _parse_dates(values):
+    # The fast ISO parser handles the export format; dateutil only sees the rest.
+    out = pd.to_datetime(values, errors="coerce", format="ISO8601")
+    odd = out.isna() & values.notna()
+    if odd.any():
+        out[odd] = pd.to_datetime(values[odd], errors="coerce", format="mixed", dayfirst=True)
+    return out
+
+
+def clean_chunk(chunk):
+    """Typed, de-duplicated rows with the derived time columns."""
+    df = chunk.drop(columns=[c for c in DROP_COLUMNS if c in chunk.columns])
+    for col in df.columns:
+        df[col] = df[col].str.strip()
+    df = df.replace(dict.fromkeys(NULL_VALUES, np.nan))
+
+    stamp = _parse_dates(df["Date"])
+    if "Time" in df.columns:
+        clock = pd.to_datetime(df["Time"], errors="coerce", format="%H:%M:%S")
+        hour = clock.dt.hour.fillna(stamp.dt.hour)
+    else:
+        hour = stamp.dt.hour
+    df["Date"] = stamp.dt.normalize()
+    for col in NUMERIC_COLUMNS:
+        if col in df.columns:
+            df[col] = pd.to_numeric(df[col], errors="coerce")
+
+    df = df[df["Date"].notna() & df["Booking_ID"].notna()]
+    df = df.drop_duplicates("Booking_ID")
+    df["Ride_Hour"] = hour.loc[df.index].astype("int8")
+    df["Ride_Week"] = df["Date"].dt.isocalendar().week.astype("int8")
+    df["Day_of_Week"] = df["Date"].dt.day_name()
+    return df
+
+
+class FenceSketch:
+    """Streaming IQR fences (Q1 - 1.5 IQR, Q3 + 1.5 IQR) per outlier column."""
+
+    def __init__(self):
+        self.buckets = LogBuckets(1e-2, 1e7)
+        self.counts = {col: np.zeros(self.buckets.size, dtype=np.int64) for col in OUTLIER_COLUMNS}
+
+    def add(self, df):
+        for col, positive_only in OUTLIER_COLUMNS.items():
+            values = df[col].to_numpy(dtype=float)
+            values = values[~np.isnan(values)]
+            if positive_only:
+                values = values[values > 0]
+            self.counts[col] += np.bincount(self.buckets.index(values), minlength=self.buckets.size)
+
+    def fences(self):
+        out = {}
+        for col, counts in self.counts.items():
+            q1, q3 = quantiles(counts, self.buckets, [0.25, 0.75])
+            out[col] = (q1 - 1.5 * (q3 - q1), q3 + 1.5 * (q3 - q1))
+        return out
+
+
+def drop_outliers(df, fences):
+    keep = pd.Series(True, index=df.index)
+    for col, (lo, hi) in fences.items():
+        values = df[col]
+        inside = values.between(lo, hi) | values.isna()
+        if OUTLIER_COLUMNS[col]:
+            inside |= values <= 0
+        keep &= inside
+    for col in RATING_COLUMNS:
+        keep &= df[col].between(1, 5) | df[col].isna()
+    return df[keep]
+
+
+# -----------------------
+# SQLite Sink
+# -----------------------
+def _sql_type(dtype):
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def open_db(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("CREATE TABLE IF NOT EXISTS ingest_log "
+                 "(source TEXT PRIMARY KEY, rows_read INTEGER, rows_inserted INTEGER, updated_at TEXT)")
+    return conn
+
+
+def _ensure_table(conn, df):
+    cols = [row[1] for row in conn.execute('PRAGMA table_info("rides")')]
+    if not cols:
+        defs = ", ".join(f'"{c}" {_sql_type(df[c].dtype)}' for c in df.columns)
+        conn.execute(f"CREATE TABLE rides ({defs})")
+        cols = list(df.columns)
+    conn.execute('CREATE INDEX IF NOT EXISTS "idx_rides_Booking_ID" ON rides ("Booking_ID")')
+    return [c for c in cols if c in df.columns]
+
+
+def existing_ids(conn, ids):
+    """The subset of ``ids`` already present in ``rides``."""
+    if not conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'rides'").fetchone():
+        return set()
+    conn.execute("CREATE TEMP TABLE IF NOT EXISTS batch_ids (id TEXT PRIMARY KEY)")
+    conn.execute("DELETE FROM batch_ids")
+    conn.executemany("INSERT OR IGNORE INTO batch_ids VALUES (?)", ((i,) for i in ids))
+    return {row[0] for row in conn.execute("SELECT id FROM batch_ids JOIN rides ON rides.Booking_ID = batch_ids.id")}
+
+
+def _records(df, cols):
+    columns = []
+    for col in cols:
+        values = df[col]
+        if pd.api.types.is_datetime64_any_dtype(values):
+            values = values.dt.strftime("%Y-%m-%d %H:%M:%S")
+        arr = values.to_numpy(dtype=object)
+        arr[values.isna().to_numpy()] = None
+        if pd.api.types.is_integer_dtype(values):
+            arr = values.to_numpy().tolist()
+        columns.append(arr)
+    return zip(*columns)
+
+
+def insert_rows(conn, df, source, rows_read):
+    """Insert ``df`` and advance the source's offset in one transaction."""
+    with conn:
+        if len(df):
+            cols = _ensure_table(conn, df)
+            sql = "INSERT INTO rides (%s) VALUES (%s)" % (
+                ", ".join(f'"{c}"' for c in cols), ", ".join("?" * len(cols)))
+            conn.executemany(sql, _records(df, cols))
+        conn.execute(
+            "INSERT INTO ingest_log VALUES (?, ?, ?, datetime('now')) ON CONFLICT(source) DO UPDATE SET "
+            "rows_read = excluded.rows_read, rows_inserted = rows_inserted + excluded.rows_inserted, "
+            "updated_at = excluded.updated_at",
+            (source, rows_read, len(df)))
+
+
+def db_offset(conn, source):
+    row = conn.execute("SELECT rows_read FROM ingest_log WHERE source = ?", (source,)).fetchone()
+    return row[0] if row else 0
+
+
+def snapshot_offset(snapshot_dir, source):
+    manifest = _read_manifest(snapshot_dir)
+    return (manifest or {}).get("ingest_log", {}).get(source, 0)
+
+
+def snapshot_ids(snapshot_dir):
+    """Booking_IDs already in the snapshot."""
+    if _read_manifest(snapshot_dir) is None:
+        return set()
+    return set(read_text_columns(snapshot_dir)["Booking_ID"].tolist())
+
+
+# -----------------------
+# Pipeline
+# -----------------------
+def _chunks(csv_path, chunksize, skip=0, usecols=None):
+    return pd.read_csv(csv_path, chunksize=chunksize, dtype=str, keep_default_na=False,
+                       skiprows=range(1, skip + 1), usecols=usecols)
+
+
+def ingest(csv_path, db_path=DB_PATH, snapshot_dir=SNAPSHOT_PATH, chunksize=200_000, restart=False, log=print):
+    source = os.path.abspath(csv_path)
+    conn = open_db(db_path)
+    db_done = 0 if restart else db_offset(conn, source)
+    snap_done = 0 if restart else snapshot_offset(snapshot_dir, source)
+    start = min(db_done, snap_done)
+    # Without offsets the snapshot cannot tell which rows it already holds,
+    # so on a restart it skips the Booking_IDs it has, like the database.
+    snap_ids = snapshot_ids(snapshot_dir) if restart else None
+
+    t0 = time.perf_counter()
+    sketch = FenceSketch()
+    for chunk in _chunks(csv_path, chunksize, usecols=list(OUTLIER_COLUMNS)):
+        sketch.add(chunk.apply(pd.to_numeric, errors="coerce"))
+    fences = sketch.fences()
+    log("fences: " + ", ".join(f"{c} [{lo:.1f}, {hi:.1f}]" for c, (lo, hi) in fences.items()))
+
+    t1 = time.perf_counter()
+    pos, read, inserted = start, 0, 0
+    for chunk in _chunks(csv_path, chunksize, skip=start):
+        end = pos + len(chunk)
+        rows = drop_outliers(clean_chunk(chunk), fences).sort_values("Date", kind="stable", ignore_index=True)
+        if db_done < end:
+            db_rows = rows[~rows["Booking_ID"].isin(existing_ids(conn, rows["Booking_ID"]))]
+        else:
+            db_rows = rows
+        if snap_ids is None:
+            snap_rows = db_rows
+        else:
+            snap_rows = rows[~np.fromiter((i in snap_ids for i in rows["Booking_ID"]), bool, len(rows))]
+            snap_ids.update(snap_rows["Booking_ID"])
+        # Snapshot first: if we stop in between, the database re-applies the
+        # chunk on resume while the snapshot (already past it) skips it.
+        if snap_done < end and (len(snap_rows) or os.path.exists(snapshot_dir)):
+            log_state = dict((_read_manifest(snapshot_dir) or {}).get("ingest_log", {}), **{source: end})
+            append_snapshot(snap_rows, snapshot_dir, ingest_log=log_state)
+        if db_done < end:
+            insert_rows(conn, db_rows, source, end)
+        read += len(chunk)
+        inserted += len(db_rows)
+        pos = end
+        elapsed = time.perf_counter() - t1
+        log(f"{pos:,} rows read, {inserted:,} written, {read / elapsed:,.0f} rows/s")
+    conn.close()
+    prepare_database(db_path)
+    if compact_snapshot(snapshot_dir):
+        log(f"compacted {snapshot_dir} into one segment")
+
+    total = time.perf_counter() - t0
+    log(f"done: {read:,} new rows read, {inserted:,} written in {total:.1f}s "
+        f"({read / (time.perf_counter() - t1) if read else 0:,.0f} rows/s load, fences {t1 - t0:.1f}s)")
+    return inserted
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("csv_path")
+    parser.add_argument("--db", default=DB_PATH)
+    parser.add_argument("--snapshot", default=SNAPSHOT_PATH)
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--restart", action="store_true", help="ignore recorded progress for this file")
+    args = parser.parse_args()
+    ingest(args.csv_path, args.db, args.snapshot, args.chunksize, args.restart,
+           log=lambda msg: print(msg, file=sys.stderr))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""Per-day prefix sums for the headline KPIs.
+
+Every additive KPI input (ride count, successes, success fare sum, ...) is
+bucketed by day once and stored as a cumulative array, so the totals for
+any sidebar date range are ``cum[hi] - cum[lo]``, independent of row count.
+"""
+import numpy as np
+
+# Per-day sums kept as prefix arrays.
+_SUMS = [
+    "rides", "success", "cancelled", "not_success",
+    "success_fare", "success_fare_n", "success_distance", "success_distance_n",
+    "driver_rating_sum", "driver_rating_n", "customer_rating_sum", "customer_rating_n",
+]
+
+
+def status_masks(status):
+    """Boolean success / ``"Canceled"`` masks for a Booking_Status column."""
+    cat = status.astype("category")
+    codes = cat.cat.codes.to_numpy()
+    categories = cat.cat.categories.astype(str)
+    success = (categories == "Success")[codes] & (codes >= 0)
+    cancelled = np.asarray(categories.str.contains("Canceled"))[codes] & (codes >= 0)
+    return success, cancelled
+
+
+def row_days(store):
+    """Day position (0 .. n_days - 1) of every row of a :class:`RideStore`."""
+    return np.repeat(np.arange(store.n_days), np.diff(store.day_offsets))
+
+
+def _ratio(num, den, scale=1.0):
+    return num / den * scale if den else float("nan")
+
+
+def _weights(df):
+    """Per-row value of each sum in ``_SUMS`` (None: every row counts 1)."""
+    success, cancelled = status_masks(df["Booking_Status"])
+    value = df["Booking_Value"].to_numpy(dtype=float)
+    distance = df["Ride_Distance"].to_numpy(dtype=float)
+    driver = df["Driver_Ratings"].to_numpy(dtype=float)
+    customer = df["Customer_Rating"].to_numpy(dtype=float)
+    fare_ok, distance_ok = success & ~np.isnan(value), success & ~np.isnan(distance)
+    driver_ok, customer_ok = ~np.isnan(driver), ~np.isnan(customer)
+    return {
+        "rides": None,
+        "success": success,
+        "cancelled": cancelled,
+        "not_success": ~success,
+        "success_fare": np.where(fare_ok, value, 0.0),
+        "success_fare_n": fare_ok,
+        "success_distance": np.where(distance_ok, distance, 0.0),
+        "success_distance_n": distance_ok,
+        "driver_rating_sum": np.where(driver_ok, driver, 0.0),
+        "driver_rating_n": driver_ok,
+        "customer_rating_sum": np.where(customer_ok, customer, 0.0),
+        "customer_rating_n": customer_ok,
+    }
+
+
+def row_totals(df):
+    """The sums of :meth:`KpiIndex.totals`, scanned from the rows of ``df``."""
+    return {name: float(len(df) if w is None else w.sum(dtype=float)) for name, w in _weights(df).items()}
+
+
+def day_sums(df, days, n_days):
+    """Per-day totals of each sum in ``_SUMS``; ``days`` is each row's day position."""
+    return {name: np.bincount(days, weights=None if w is None else w.astype(float), minlength=n_days)
+            for name, w in _weights(df).items()}
+
+
+class KpiIndex:
+    """Prefix sums over a :class:`data_store.RideStore`, one slot per day.
+
+    ``per_day`` (see :func:`day_sums`) may be passed in when it was
+    computed elsewhere, e.g. partition by partition in :mod:`precompute`.
+    """
+
+    def __init__(self, store, per_day=None):
+        self.store = store
+        if per_day is None:
+            per_day = day_sums(store.df, row_days(store), store.n_days)
+        self.cum = {name: np.concatenate([[0.0], np.cumsum(per_day[name])]) for name in _SUMS}
+
+    def totals(self, start, end):
+        """Raw sums for the inclusive date range."""
+        lo, hi = self.store.day_index(start, end)
+        return {name: float(c[hi] - c[lo]) for name, c in self.cum.items()}
+
+    def summary(self, start, end):
+        """Home page KPIs plus the figures of the EDA KPI Summary."""
+        return summarize(self.totals(start, end))
+
+
+def summarize(t):
+    """KPI figures from the raw sums in ``_SUMS`` (see :meth:`KpiIndex.totals`)."""
+    return {
+        "total_rides": int(t["rides"]),
+        "successful_rides": int(t["success"]),
+        "success_rate": _ratio(t["success"], t["rides"], 100),
+        "cancel_rate": _ratio(t["cancelled"], t["rides"], 100),
+        "total_cancellations": int(t["not_success"]),
+        "not_success_rate": _ratio(t["not_success"], t["rides"], 100),
+        "avg_fare": _ratio(t["success_fare"], t["success_fare_n"]),
+        "avg_distance": _ratio(t["success_distance"], t["success_distance_n"]),
+        "avg_driver_rating": _ratio(t["driver_rating_sum"], t["driver_rating_n"]),
+        "avg_customer_rating": _ratio(t["customer_rating_sum"], t["customer_rating_n"]),
+    }
+
+
+def scan_kpis(df_filtered):
+    """The original full-scan Home KPIs, kept for benchmarking."""
+    return {
+        "total_rides": len(df_filtered),
+        "success_rate": df_filtered["Booking_Status"].eq("Success").mean() * 100,
+        "avg_fare": df_filtered.loc[df_filtered["Booking_Status"] == "Success", "Booking_Value"].mean(),
+        "cancel_rate": df_filtered["Booking_Status"].str.contains("Canceled").mean() * 100,
+    }
@@ -0,0 +1,100 @@
+"""Plotly figure builders whose payload does not grow with the row count."""
+import os
+from collections import namedtuple
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+# Scatter plots above this many rides are drawn as a server-side density grid.
+SCATTER_POINT_BUDGET = int(os.environ.get("OLA_SCATTER_POINT_BUDGET", 20_000))
+
+# Bin centres along x and y, and the ride count per bin as ``counts[y, x]``.
+Grid = namedtuple("Grid", ["x", "y", "counts"])
+# Either sampled ``points`` (a DataFrame) or a density ``grid``, over ``total`` rides.
+Scatter = namedtuple("Scatter", ["points", "grid", "total"])
+
+
+def _xy(df, x, y):
+    xs = df[x].to_numpy(dtype=float)
+    ys = df[y].to_numpy(dtype=float)
+    ok = ~(np.isnan(xs) | np.isnan(ys))
+    return xs[ok], ys[ok], ok
+
+
+def _grid_bins(xs, ys, bins):
+    x_edges = np.histogram_bin_edges(xs, bins=bins)
+    y_edges = np.histogram_bin_edges(ys, bins=bins)
+    xi = np.clip(np.searchsorted(x_edges, xs, side="right") - 1, 0, bins - 1)
+    yi = np.clip(np.searchsorted(y_edges, ys, side="right") - 1, 0, bins - 1)
+    return xi * bins + yi
+
+
+def stratified_sample(df, x, y, budget, bins=50, seed=0):
+    """At most ``budget`` rows, sampled per x/y grid cell so sparse regions survive."""
+    xs, ys, ok = _xy(df, x, y)
+    rows = np.flatnonzero(ok)
+    if len(rows) <= budget:
+        return df.iloc[rows]
+    cell = _grid_bins(xs, ys, bins)
+    counts = np.bincount(cell, minlength=bins * bins)
+    quota = np.maximum(np.round(counts * (budget / len(rows))), 1)
+    rng = np.random.default_rng(seed)
+    # Cell id plus a [0, 1) jitter: grouped by cell, random order within it.
+    order = np.argsort(cell + rng.random(len(rows)))
+    sorted_cell = cell[order]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    rank = np.arange(len(order)) - starts[sorted_cell]
+    keep = rank < quota[sorted_cell]
+    picked, rank, quota = order[keep], rank[keep], quota[sorted_cell[keep]]
+    if len(picked) > budget:
+        # The minimum of one row per cell can overshoot: keep every cell's first
+        # row, then trim the other rows of each cell by the same fraction of its quota.
+        picked = picked[np.lexsort(((rank + rng.random(len(rank))) / quota, rank > 0))[:budget]]
+    return df.iloc[np.sort(rows[picked])]
+
+
+def density_grid(xs, ys, bins=80):
+    """2D histogram as bin centres and ``counts[y, x]``."""
+    counts, x_edges, y_edges = np.histogram2d(xs, ys, bins=bins)
+    return Grid((x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2, counts.T)
+
+
+def scatter_data(df, x, y, budget=SCATTER_POINT_BUDGET, strategy="density"):
+    """Everything :func:`scatter_figure` needs; never more than ``budget`` points.
+
+    ``total`` counts the rides with both ``x`` and ``y``, the ones a plot can show.
+    """
+    xs, ys, ok = _xy(df, x, y)
+    total = int(ok.sum())
+    if total > budget and strategy == "density":
+        return Scatter(None, density_grid(xs, ys), total)
+    points = stratified_sample(df, x, y, budget) if total > budget else df[ok]
+    return Scatter(points, None, total)
+
+
+# -----------------------
+# Figures
+# -----------------------
+def heatmap_figure(grid, x, y, title):
+    """Server-side density grid; the browser only receives the bins."""
+    fig = go.Figure(go.Heatmap(
+        x=grid.x,
+        y=grid.y,
+        z=np.where(grid.counts > 0, grid.counts, np.nan),
+        colorscale="Viridis",
+        colorbar={"title": "Rides"},
+        hovertemplate=f"{x}=%{{x:.1f}}<br>{y}=%{{y:.0f}}<br>rides=%{{z}}<extra></extra>",
+    ))
+    fig.update_layout(title=title, xaxis_title=x, yaxis_title=y)
+    return fig
+
+
+def scatter_figure(data, x, y, title, **kwargs):
+    """WebGL scatter of ``data.points``, or a heatmap of ``data.grid``.  Extra kwargs go to ``px.scatter``."""
+    if data.grid is not None:
+        return heatmap_figure(data.grid, x, y, title + f" (density of {data.total:,} rides)")
+    if len(data.points) < data.total:
+        title += f" (stratified sample of {len(data.points):,} / {data.total:,} rides)"
+    return px.scatter(data.points, x=x, y=y, title=title, render_mode="webgl", **kwargs)
+
@@ -0,0 +1,186 @@
+"""Partitioned, parallel precompute of the in-memory backend's indexes.
+
+The per-day aggregates behind :class:`kpis.KpiIndex`,
+:class:`sketches.DistributionIndex`, :class:`rollup.RollupCube` and
+:class:`topk.TopKIndex` are computed per partition of whole weeks (Monday to Sunday, like Ride_Week)
+in a ``ProcessPoolExecutor``.  Each worker maps the columnar snapshot
+itself and slices its partition's rows, so no rows are pickled to the
+workers.  Partitions cover disjoint days, so combining
+their partials is concatenation along the day axis (sum and count arrays,
+rollup cells, top-k day summaries); prefix sums and the top-k spans above
+the days are then built once from the merged arrays.
+
+Partials are kept between runs with a fingerprint (hash) of each
+partition's rows, categorical columns hashed by label, so after a day of
+new data only the week it falls in is recomputed.  The distribution layout the partials depend on is checked
+too, and a change there recomputes every partition.
+"""
+import hashlib
+import multiprocessing
+import os
+import time
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from data_store import RideStore, read_snapshot
+from kpis import KpiIndex, day_sums
+from rollup import RollupCube, aggregate_rows
+from sketches import DistributionIndex, day_counts, distribution_layout
+from topk import TopKIndex, day_summaries, supports
+
+PARTITION_DAYS = 7
+# Workers are forked from a single-threaded fork server (spawned where there
+# is none), never from the calling process: the app runs precompute on its
+# refresher thread, and a fork of its multi-threaded server could inherit a
+# lock held by another thread.  Workers import the caller's main module
+# again, so a script that starts them keeps its work behind a
+# ``__name__ == "__main__"`` guard, as app.py does.
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+if _MP_CONTEXT.get_start_method() == "forkserver":
+    _MP_CONTEXT.set_forkserver_preload([__name__])
+# Day 0 (1970-01-01) was a Thursday; shifting by 3 starts partitions on Mondays.
+_WEEK_SHIFT = 3
+
+Partial = namedtuple("Partial", ["fingerprint", "kpis", "values", "hists", "cells", "topk"])
+Indexes = namedtuple("Indexes", ["kpis", "dists", "cube", "topk"])
+
+
+def partitions(store, partition_days=PARTITION_DAYS):
+    """``(key, lo, hi)`` per partition: its first absolute day and its day positions ``lo:hi``."""
+    out, lo = [], 0
+    while lo < store.n_days:
+        key = store.first_day + lo
+        hi = min(lo + partition_days - (key + _WEEK_SHIFT) % partition_days, store.n_days)
+        out.append((key, lo, hi))
+        lo = hi
+    return out
+
+
+def _fingerprint(df, n_days, label_hashes):
+    """Hash of the partition's rows; ``label_hashes`` caches per-category hashes across partitions."""
+    digest = hashlib.sha1(str((len(df), n_days)).encode())
+    for name in df.columns:
+        col = df[name]
+        if isinstance(col.dtype, pd.CategoricalDtype):
+            # Labels, not codes: a relabel keeps the codes, and a new label
+            # sorting in ahead shifts them without changing the rows.
+            if name not in label_hashes:
+                hashes = pd.util.hash_array(col.cat.categories.to_numpy(dtype=object))
+                label_hashes[name] = np.append(hashes, np.uint64(0))  # code -1 (NaN) reads the last slot
+            values = label_hashes[name][col.cat.codes.to_numpy()]
+        else:
+            values = col.to_numpy()
+        if values.dtype == object:
+            values = pd.util.hash_array(values)
+        digest.update(np.ascontiguousarray(values).view(np.uint8))
+    return digest.hexdigest()
+
+
+def _rows(store, lo, hi):
+    return store.df.iloc[store.day_offsets[lo]:store.day_offsets[hi]]
+
+
+def compute_partial(store, lo, hi, layout, aggs, fingerprint=None):
+    """Partial aggregates for day positions ``lo:hi`` of ``store``."""
+    offsets = store.day_offsets
+    df = _rows(store, lo, hi)
+    days = np.repeat(np.arange(hi - lo), np.diff(offsets[lo:hi + 1]))
+    values, hists = day_counts(df, days, hi - lo, layout)
+    return Partial(fingerprint, day_sums(df, days, hi - lo), values, hists,
+                   aggregate_rows(df, store.first_day + lo + days), day_summaries(df, days, hi - lo, aggs))
+
+
+# -----------------------
+# Workers
+# -----------------------
+_worker_stores = {}
+
+
+def _partition_task(snapshot_dir, shape, lo, hi, layout, aggs, fingerprint):
+    store = _worker_stores.get(snapshot_dir)
+    if store is None or (len(store), store.first_day) != shape:
+        store = _worker_stores[snapshot_dir] = RideStore(read_snapshot(snapshot_dir, text=False))
+    if (len(store), store.first_day) != shape:
+        raise RuntimeError("snapshot %s changed during precompute" % snapshot_dir)
+    return compute_partial(store, lo, hi, layout, aggs, fingerprint)
+
+
+# -----------------------
+# Precompute
+# -----------------------
+def _covers(old, new):
+    """Whether data laid out as ``new`` also fits ``old``, so ``old`` can be kept."""
+    return (old.vehicles == new.vehicles
+            and old.buckets.relative_error == new.buckets.relative_error
+            and old.buckets.min_key <= new.buckets.min_key
+            and old.buckets.min_key + old.buckets.size >= new.buckets.min_key + new.buckets.size
+            and all(old.hist_edges[c][0] <= e[0] and old.hist_edges[c][-1] >= e[-1]
+                    for c, e in new.hist_edges.items()))
+
+
+class Precompute:
+    """Builds the indexes of a store, reusing the partials of the previous run.
+
+    Only partitions whose fingerprint changed are recomputed.  They go to
+    a process pool when there are several and ``workers > 1``; otherwise
+    (or without a ``snapshot_dir`` for the workers to map) they are
+    computed in-process, which skips the pool's start-up cost.
+    """
+
+    def __init__(self, aggs, workers=None, partition_days=PARTITION_DAYS):
+        self.aggs = {name: agg for name, agg in aggs.items() if supports(agg)}
+        self.workers = os.cpu_count() if workers is None else workers
+        self.partition_days = partition_days
+        self.stats = {}
+        self._layout = None
+        self._partials = {}
+
+    def _check_dependencies(self, df):
+        """Keep the previous layout and partials if the new data is compatible with them."""
+        layout = distribution_layout(df)
+        if self._layout is None or not _covers(self._layout, layout):
+            self._layout, self._partials = layout, {}
+
+    def run(self, store, snapshot_dir=None):
+        start = time.perf_counter()
+        self._check_dependencies(store.df)
+        parts = partitions(store, self.partition_days)
+        stale, label_hashes = [], {}
+        for key, lo, hi in parts:
+            fingerprint = _fingerprint(_rows(store, lo, hi), hi - lo, label_hashes)
+            if getattr(self._partials.get(key), "fingerprint", None) != fingerprint:
+                stale.append((key, lo, hi, fingerprint))
+        if self.workers > 1 and snapshot_dir is not None and len(stale) > 1:
+            shape = (len(store), store.first_day)
+            with ProcessPoolExecutor(min(self.workers, len(stale)), mp_context=_MP_CONTEXT) as pool:
+                futures = [pool.submit(_partition_task, snapshot_dir, shape, lo, hi, self._layout, self.aggs, fp)
+                           for _, lo, hi, fp in stale]
+                results = [future.result() for future in futures]
+        else:
+            results = [compute_partial(store, lo, hi, self._layout, self.aggs, fp) for _, lo, hi, fp in stale]
+
+        fresh = {key: result for (key, _, _, _), result in zip(stale, results)}
+        self._partials = {key: fresh.get(key) or self._partials[key] for key, _, _ in parts}
+        indexes = self._merge(store, parts)
+        self.stats = {"partitions": len(parts), "recomputed": len(stale), "seconds": time.perf_counter() - start}
+        return indexes
+
+    def _merge(self, store, parts):
+        layout = self._layout
+        if not parts:
+            return Indexes(KpiIndex(store), DistributionIndex(store, layout), RollupCube(store),
+                           TopKIndex(store, self.aggs))
+        merged = [self._partials[key] for key, _, _ in parts]
+        per_day = {name: np.concatenate([p.kpis[name] for p in merged]) for name in merged[0].kpis}
+        values = np.concatenate([p.values for p in merged])
+        hists = {column: np.concatenate([p.hists[column] for p in merged]) for column in layout.hist_edges}
+        cells = pd.concat([p.cells for p in merged], ignore_index=True)
+        days = {name: (np.concatenate([p.topk[name][0] + lo for p, (_, lo, _) in zip(merged, parts)]),
+                       *(np.concatenate([p.topk[name][i] for p in merged]) for i in (1, 2, 3)))
+                for name in self.aggs}
+        return Indexes(KpiIndex(store, per_day), DistributionIndex(store, layout, (values, hists)),
+                       RollupCube(store, cells), TopKIndex(store, self.aggs, days=days))
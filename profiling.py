@@ -0,0 +1,119 @@
+"""Opt-in timing and memory instrumentation for the dashboard (OLA_PROFILE=1).
+
+A :class:`Profiler` records spans (data loading, filtering, each chart's
+aggregation and figure build, each ``st.plotly_chart`` call) with their
+wall time, the memory allocated while they ran according to tracemalloc
+(net, and peak above the starting point) and, where given, the payload
+bytes sent to the browser.  Spans nest: a chart's figure build contains
+the aggregations it triggered.
+
+The app shows a rerun's spans in a collapsible sidebar panel, offers them
+for download as Chrome-trace JSON (chrome://tracing or Perfetto) and, with
+OLA_PROFILE_LOG set to a path, appends them to a JSON-lines log.
+
+tracemalloc is process-wide and makes every allocation slower, which is why
+this is off by default.  Allocations made at the same time by other threads
+(another session's rerun, a background refresh) are counted too.
+"""
+import datetime
+import json
+import os
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+
+
+class Profiler:
+    """Spans of one rerun or one data load; a no-op unless ``enabled``."""
+
+    def __init__(self, enabled=True, label=""):
+        self.enabled = enabled
+        self.label = label
+        self.spans = []
+        self._local = threading.local()
+        if enabled and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @contextmanager
+    def span(self, name, category, payload=None):
+        """Time the block; ``payload()``, if given, returns what was sent and is measured afterwards."""
+        if not self.enabled:
+            yield
+            return
+        stack = self._local.__dict__.setdefault("stack", [])
+        current, peak = tracemalloc.get_traced_memory()
+        # tracemalloc has a single peak: hand the enclosing span the peak so
+        # far before resetting it for this one.
+        if stack:
+            stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        frame = {"peak": current}
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            stack.pop()
+            end, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, frame["peak"])
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            self.spans.append({
+                "name": name,
+                "category": category,
+                "depth": len(stack),
+                "thread": threading.get_ident(),
+                "start": start,
+                "seconds": seconds,
+                "alloc_bytes": end - current,
+                "peak_bytes": peak - current,
+                "payload_bytes": len(payload()) if payload is not None else None,
+            })
+
+    def frame(self):
+        """The spans in start order, for display."""
+        spans = sorted(self.spans, key=lambda s: s["start"])
+        return pd.DataFrame({
+            "span": ["  " * s["depth"] + s["name"] for s in spans],
+            "category": [s["category"] for s in spans],
+            "ms": [s["seconds"] * 1e3 for s in spans],
+            "alloc MB": [s["alloc_bytes"] / 2**20 for s in spans],
+            "peak MB": [s["peak_bytes"] / 2**20 for s in spans],
+            "payload KB": [s["payload_bytes"] / 1024 if s["payload_bytes"] is not None else None for s in spans],
+        })
+
+    def log(self, path, **context):
+        """Append the spans to the JSON-lines file ``path``, each with ``context``."""
+        logged_at = datetime.datetime.now().isoformat(timespec="milliseconds")
+        lines = [json.dumps(dict(context, profile=self.label, logged_at=logged_at, pid=os.getpid(), **span)) + "\n"
+                 for span in sorted(self.spans, key=lambda s: s["start"])]
+        with open(path, "a") as fh:
+            fh.write("".join(lines))
+
+
+def chrome_trace(profilers):
+    """Chrome-trace JSON (complete events, in microseconds) of the spans of ``profilers``."""
+    spans = [(pid, span) for pid, profiler in enumerate(profilers) for span in profiler.spans]
+    origin = min((span["start"] for _, span in spans), default=0.0)
+    # Each profiler shows as a process named by its label.
+    events = [{"name": "process_name", "ph": "M", "pid": pid, "args": {"name": profiler.label}}
+              for pid, profiler in enumerate(profilers)]
+    for pid, span in spans:
+        events.append({
+            "name": span["name"],
+            "cat": span["category"],
+            "ph": "X",
+            "ts": (span["start"] - origin) * 1e6,
+            "dur": span["seconds"] * 1e6,
+            "pid": pid,
+            "tid": span["thread"],
+            "args": {key: span[key] for key in ("alloc_bytes", "peak_bytes", "payload_bytes")},
+        })
+    return json.dumps({"traceEvents": events, "displayTimeUnit": "ms"})
+
+
+NO_PROFILER = Profiler(enabled=False)
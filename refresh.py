@@ -0,0 +1,85 @@
+"""Background refresh of the dashboard's derived data.
+
+A :class:`DataRefresher` owns the current :class:`Generation`: the data
+version it was built from and whatever ``build`` derived from it (for the
+app, the backend with its snapshot, KPI prefix sums, rollup cube and
+sketches, plus a query engine over the freshly indexed database).
+
+A daemon thread polls the version and, once a new one has been stable for
+two polls (so a half-written file is not picked up), builds the next
+generation off the request path and swaps it in with a single reference
+assignment.  A rerun takes :meth:`DataRefresher.current` once at the top,
+so it finishes on the generation it started with and the next rerun sees
+the new one.  If a build fails the old generation keeps being served and
+the error is kept for display.
+"""
+import datetime
+import threading
+import time
+from collections import namedtuple
+
+Generation = namedtuple("Generation", ["number", "version", "value", "loaded_at", "seconds"])
+
+
+class DataRefresher:
+    """Polls ``version()`` every ``interval`` seconds and rebuilds on change.
+
+    ``build(version, previous)`` returns the derived value for ``version``;
+    ``previous`` is the generation being replaced (None on the first load),
+    so the parts that did not change can be reused.  The version is read
+    again after the build, since building may itself touch the watched
+    files (a rebuilt snapshot manifest, an indexed database).
+
+    ``retire(old, new)``, if given, is called with the replaced and the new
+    value after a swap, to release what the new value no longer uses.
+    Reruns that took the old generation may still be running.
+    """
+
+    def __init__(self, build, version, interval=10.0, retire=None):
+        self._build = build
+        self._retire = retire
+        self._version = version
+        self.interval = interval
+        self.error = None
+        self._pending = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._current = self._load(version(), None)
+        self._thread = threading.Thread(target=self._watch, name="data-refresher", daemon=True)
+        self._thread.start()
+
+    def current(self):
+        return self._current
+
+    def _load(self, version, previous):
+        start = time.perf_counter()
+        value = self._build(version, previous)
+        return Generation((previous.number + 1) if previous else 1, self._version(), value,
+                          datetime.datetime.now(), time.perf_counter() - start)
+
+    def check(self):
+        """Rebuild if the version changed and has settled; True if a new generation was swapped in."""
+        with self._lock:
+            version = self._version()
+            if version == self._current.version:
+                self._pending = None
+                return False
+            if version != self._pending:
+                self._pending = version
+                return False
+            try:
+                generation = self._load(version, self._current)
+            except Exception as exc:
+                self.error = exc
+                return False
+            previous, self._current, self._pending, self.error = self._current, generation, None, None
+            if self._retire is not None:
+                self._retire(previous.value, generation.value)
+            return True
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def stop(self):
+        self._stop.set()
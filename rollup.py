@@ -0,0 +1,90 @@
+"""Materialized rollup of the rides table for the EDA charts.
+
+One row per observed (day, Vehicle_Type, Booking_Status, Payment_Method,
+Ride_Hour, Day_of_Week) cell, holding the ride count and the sum and
+non-null count of each measure.  Cells are kept sorted by day so a date
+range is a ``searchsorted`` slice, and charts aggregate that slice (a few
+thousand cells) instead of the raw rows.
+
+Incremental refresh lives in :mod:`precompute`, which aggregates the cells
+per week and only recomputes the weeks whose rows changed.
+"""
+import numpy as np
+import pandas as pd
+
+from fused import result_column, sort_order
+from kpis import row_days
+
+DIMENSIONS = ["Vehicle_Type", "Booking_Status", "Payment_Method", "Ride_Hour", "Day_of_Week"]
+MEASURES = ["Booking_Value", "Ride_Distance", "Driver_Ratings", "Customer_Rating"]
+
+
+def aggregate_rows(df, days):
+    """Cube cells for ``df``; ``days`` is each row's absolute day number."""
+    keys = {"day": np.asarray(days, dtype="int64")}
+    for dim in DIMENSIONS:
+        col = df[dim]
+        keys[dim] = col.astype(str).where(col.notna()) if isinstance(col.dtype, pd.CategoricalDtype) else col
+    frame = pd.DataFrame(keys)
+    frame["rides"] = 1
+    for m in MEASURES:
+        values = df[m].to_numpy(dtype=float)
+        frame[m + "_sum"] = np.nan_to_num(values)
+        frame[m + "_n"] = ~np.isnan(values)
+    cells = frame.groupby(["day"] + DIMENSIONS, dropna=False, sort=False, observed=True).sum()
+    return cells.reset_index().sort_values("day", kind="stable", ignore_index=True)
+
+
+class RollupCube:
+    """Day-sorted rollup cells of a :class:`data_store.RideStore`.
+
+    ``cells`` (see :func:`aggregate_rows`) may be passed in when they were
+    computed elsewhere, e.g. partition by partition in :mod:`precompute`.
+    """
+
+    def __init__(self, store, cells=None):
+        self.store = store
+        if cells is None:
+            cells = aggregate_rows(store.df, store.first_day + row_days(store))
+        self.cells = cells
+
+    def slice(self, start, end):
+        """Cells with ``start <= day <= end``."""
+        cells = self.cells
+        days = cells["day"].to_numpy()
+        lo_day, hi_day = (int(pd.Timestamp(d).to_datetime64().astype("datetime64[D]").view("int64"))
+                          for d in (start, end))
+        lo, hi = np.searchsorted(days, [lo_day, hi_day + 1])
+        return cells.iloc[lo:hi]
+
+
+# -----------------------
+# Chart Queries
+# -----------------------
+def cube_supports(agg):
+    """Whether a :class:`fused.Agg` can be answered from the cube cells."""
+    return (agg.by in DIMENSIONS + ["Date"]
+            and (agg.where is None or agg.where[0] in DIMENSIONS)
+            and (agg.stat == "count" or agg.value in MEASURES))
+
+
+def run_agg(cells, agg):
+    """Evaluate a :class:`fused.Agg` over cube cells; same output as :func:`fused.run`."""
+    if agg.where is not None:
+        col, op, label = agg.where
+        values = cells[col].astype(str)
+        cells = cells[values == label if op == "eq" else values.str.contains(label, regex=False)]
+    if agg.by == "Date":
+        cells = cells.assign(Date=pd.to_datetime(cells["day"], unit="D"))
+    g = cells.groupby(agg.by, observed=True)
+    if agg.stat == "count":
+        result = g["rides"].sum()
+    elif agg.stat == "sum":
+        result = g[agg.value + "_sum"].sum()
+    else:
+        n = g[agg.value + "_n"].sum()
+        result = (g[agg.value + "_sum"].sum() / n)[n > 0]
+    if agg.top is not None:
+        result = result.nlargest(agg.top)
+    result = result.sort_values(ascending=False, kind="stable") if sort_order(agg) == "value" else result.sort_index()
+    return result.rename(result_column(agg)).reset_index()
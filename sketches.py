@@ -0,0 +1,178 @@
+"""Mergeable per-day distribution summaries for box plots and histograms.
+
+* Quantiles use a DDSketch-style log-bucket sketch: a value ``x > 0`` goes to
+  bucket ``ceil(log_gamma(x))`` with ``gamma = (1 + a) / (1 - a)``, so any
+  quantile read back is within relative error ``a`` of a true sample.
+  Sketches merge by adding bucket counts.
+* Histograms use fixed bins chosen once over the full data range.
+
+Both are bucketed per day and kept as prefix sums (like :mod:`kpis`), so
+merging over any date range is ``cum[hi] - cum[lo]``.  Rows already
+selected by the sidebar filters are bucketed on the fly with the same
+layout instead.
+"""
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from kpis import row_days, status_masks
+
+RELATIVE_ERROR = 0.01
+
+# column -> number of fixed bins (matches the nbins the charts used)
+HISTOGRAMS = {"Customer_Rating": 20, "Driver_Ratings": 20, "Ride_Distance": 50}
+
+
+class LogBuckets:
+    """Bucket layout of the quantile sketch for values in ``[lo, hi]``."""
+
+    def __init__(self, lo, hi, relative_error=RELATIVE_ERROR):
+        self.relative_error = relative_error
+        self.gamma = (1 + relative_error) / (1 - relative_error)
+        self.log_gamma = np.log(self.gamma)
+        lo = max(lo, 1e-9)
+        self.min_key = int(np.ceil(np.log(lo) / self.log_gamma))
+        self.size = int(np.ceil(np.log(max(hi, lo)) / self.log_gamma)) - self.min_key + 2
+
+    def index(self, values):
+        """Bucket per value; slot 0 holds zeros and negatives."""
+        out = np.zeros(len(values), dtype=np.intp)
+        pos = values > 0
+        keys = np.ceil(np.log(values[pos]) / self.log_gamma).astype(np.intp)
+        out[pos] = np.clip(keys - self.min_key + 1, 1, self.size - 1)
+        return out
+
+    def value(self, slots):
+        keys = np.asarray(slots) + self.min_key - 1
+        est = 2 * self.gamma ** keys / (self.gamma + 1)
+        return np.where(np.asarray(slots) == 0, 0.0, est)
+
+
+def _prefix(per_day):
+    return np.concatenate([np.zeros((1,) + per_day.shape[1:], dtype=np.int64), np.cumsum(per_day, axis=0)])
+
+
+def quantiles(counts, buckets, qs):
+    """Estimated quantiles ``qs`` from one merged bucket-count vector."""
+    total = counts.sum()
+    if total == 0:
+        return np.full(len(qs), np.nan)
+    cum = np.cumsum(counts)
+    ranks = np.asarray(qs) * (total - 1)
+    return buckets.value(np.searchsorted(cum, ranks, side="right"))
+
+
+# Everything per-day counts depend on; fixed over the whole data so that
+# counts computed for different days (or partitions) add up.
+Layout = namedtuple("Layout", ["vehicles", "buckets", "hist_edges"])
+
+
+def distribution_layout(df):
+    """Vehicle_Type labels, quantile buckets and histogram edges for ``df``."""
+    vehicle = df["Vehicle_Type"].astype("category")
+    value = df["Booking_Value"].to_numpy(dtype=float)
+    finite = value[~np.isnan(value) & (vehicle.cat.codes.to_numpy() >= 0)]
+    buckets = LogBuckets(finite.min() if len(finite) else 1.0, finite.max() if len(finite) else 1.0)
+    edges = {}
+    for column, bins in HISTOGRAMS.items():
+        values = df[column].to_numpy(dtype=float)
+        keep = ~np.isnan(values)
+        edges[column] = np.histogram_bin_edges(values[keep], bins=bins) if keep.any() else np.linspace(0, 1, bins + 1)
+    return Layout(list(vehicle.cat.categories.astype(str)), buckets, edges)
+
+
+def day_counts(df, days, n_days, layout):
+    """Per-day counts under ``layout``: ``(values, {column: histogram})``.
+
+    ``values`` is Booking_Value bucket counts per day x Vehicle_Type x
+    success flag; ``days`` is each row's day position.
+    """
+    buckets = layout.buckets
+    vehicle = pd.Categorical(df["Vehicle_Type"], categories=layout.vehicles).codes.astype(np.intp)
+    success, _ = status_masks(df["Booking_Status"])
+    value = df["Booking_Value"].to_numpy(dtype=float)
+    ok = ~np.isnan(value) & (vehicle >= 0)
+    n_groups = 2 * len(layout.vehicles)
+    flat = (days[ok] * n_groups + vehicle[ok] * 2 + success[ok]) * buckets.size + buckets.index(value[ok])
+    values = np.bincount(flat, minlength=n_days * n_groups * buckets.size)
+    values = values.reshape(n_days, len(layout.vehicles), 2, buckets.size)
+
+    hists = {}
+    for column, edges in layout.hist_edges.items():
+        bins = len(edges) - 1
+        col = df[column].to_numpy(dtype=float)
+        keep = ~np.isnan(col)
+        slot = np.clip(np.searchsorted(edges, col[keep], side="right") - 1, 0, bins - 1)
+        hists[column] = np.bincount(days[keep] * bins + slot, minlength=n_days * bins).reshape(n_days, bins)
+    return values, hists
+
+
+class DistributionIndex:
+    """Per-day quantile sketches of Booking_Value and fixed-bin histograms.
+
+    ``layout`` and ``per_day`` (see :func:`day_counts`) may be passed in
+    when they were computed elsewhere, e.g. by :mod:`precompute`.
+    """
+
+    def __init__(self, store, layout=None, per_day=None):
+        self.store = store
+        self.layout = layout = layout or distribution_layout(store.df)
+        self.vehicles, self.buckets, self.hist_edges = layout
+        values, hists = per_day or day_counts(store.df, row_days(store), store.n_days, layout)
+        self.value_cum = _prefix(values)
+        self.hist_cum = {column: _prefix(counts) for column, counts in hists.items()}
+
+    def _value_counts(self, start, end, rows=None):
+        """Vehicle_Type x success x bucket counts for the date range, or for ``rows`` if given."""
+        if rows is None:
+            lo, hi = self.store.day_index(start, end)
+            return self.value_cum[hi] - self.value_cum[lo]
+        return day_counts(rows, np.zeros(len(rows), dtype=np.intp), 1, self.layout)[0][0]
+
+    def median_fare(self, start, end, rows=None):
+        """Median Booking_Value of successful rides in the date range (or in ``rows``)."""
+        counts = self._value_counts(start, end, rows)[:, 1].sum(axis=0)
+        return float(quantiles(counts, self.buckets, [0.5])[0])
+
+    def box_stats(self, start, end, rows=None):
+        """Five-number summary (Tukey fences) of Booking_Value per Vehicle_Type, by label as on the other backends."""
+        counts = self._value_counts(start, end, rows).sum(axis=1)
+        rows = []
+        for name, c in zip(self.vehicles, counts):
+            if c.sum() == 0:
+                continue
+            q1, med, q3 = quantiles(c, self.buckets, [0.25, 0.5, 0.75])
+            present = self.buckets.value(np.flatnonzero(c))
+            iqr = q3 - q1
+            lower = present[present >= q1 - 1.5 * iqr].min()
+            upper = present[present <= q3 + 1.5 * iqr].max()
+            rows.append((name, q1, med, q3, lower, upper))
+        return sorted(rows, key=lambda row: row[0])
+
+    def histogram(self, column, start, end, rows=None):
+        edges = self.hist_edges[column]
+        if rows is None:
+            lo, hi = self.store.day_index(start, end)
+            return edges, self.hist_cum[column][hi] - self.hist_cum[column][lo]
+        return edges, day_counts(rows, np.zeros(len(rows), dtype=np.intp), 1, self.layout)[1][column][0]
+
+
+# -----------------------
+# Figures
+# -----------------------
+def box_figure(rows, title):
+    """Box plot from :meth:`DistributionIndex.box_stats` rows."""
+    names, q1, med, q3, lower, upper = (list(col) for col in zip(*rows)) if rows else ([],) * 6
+    fig = go.Figure(go.Box(x=names, q1=q1, median=med, q3=q3, lowerfence=lower, upperfence=upper,
+                           name="Booking_Value", boxpoints=False))
+    fig.update_layout(title=title, xaxis_title="Vehicle_Type", yaxis_title="Booking_Value")
+    return fig
+
+
+def histogram_figure(edges, counts, column, title):
+    fig = go.Figure(go.Bar(x=(edges[:-1] + edges[1:]) / 2, y=counts, width=np.diff(edges),
+                           name=column, hovertemplate="%{x}<br>count=%{y}<extra></extra>"))
+    fig.update_layout(title=title, xaxis_title=column, yaxis_title="count", bargap=0)
+    return fig
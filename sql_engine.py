@@ -0,0 +1,176 @@
+"""Pooled, indexed and cached access to the ``rides`` table in ola_rides.db."""
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+
+import pandas as pd
+
+# Columns the canned queries and the SQLite backend filter and group on.
+INDEXED_COLUMNS = ["Date", "Booking_Status", "Vehicle_Type", "Customer_ID", "Payment_Method", "Incomplete_Rides"]
+
+QueryResult = namedtuple("QueryResult", ["frame", "seconds", "plan", "cached"])
+
+
+def prepare_database(db_path, table="rides", columns=INDEXED_COLUMNS):
+    """Switch the database to WAL and create any missing indexes.
+
+    Needs write access; on a read-only deployment this is skipped and the
+    queries simply run without the extra indexes.  A missing database is
+    left missing rather than created empty.
+    """
+    if not os.path.exists(db_path):
+        return False
+    try:
+        conn = sqlite3.connect("file:%s?mode=rw" % os.path.abspath(db_path), uri=True)
+    except sqlite3.Error:
+        return False
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        existing = {row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')}
+        for column in columns:
+            if column in existing:
+                conn.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table}_{column}" ON "{table}" ("{column}")')
+        conn.execute("ANALYZE")
+        conn.commit()
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
+
+
+class DatabaseVersion:
+    """Callable that changes whenever the database is written or replaced.
+
+    Commits are seen through ``PRAGMA data_version`` on a connection held for
+    the purpose, which counts changes made by other connections, WAL frames
+    not yet checkpointed included.  The stat of the main file catches it
+    being replaced.  The ``-wal`` and ``-shm`` files are not looked at: any
+    reader creates them, so they change without the data changing.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._conn = None
+        self._file = None
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            try:
+                st = os.stat(self.db_path)
+            except OSError:
+                self._close()
+                return None
+            if (st.st_dev, st.st_ino) != self._file:
+                self._close()
+                uri = "file:%s?mode=ro" % os.path.abspath(self.db_path)
+                self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                self._file = (st.st_dev, st.st_ino)
+            try:
+                changes = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            except sqlite3.DatabaseError:
+                self._close()
+                changes = None
+            return (st.st_ino, st.st_mtime_ns, st.st_size, changes)
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+        self._conn = self._file = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+
+class QueryEngine:
+    """Read-only connection pool with an LRU cache of query results."""
+
+    def __init__(self, db_path, pool_size=4, cache_size=64, mmap_bytes=256 * 2**20):
+        self.db_path = db_path
+        self.mmap_bytes = mmap_bytes
+        self.cache_size = cache_size
+        self._pool = queue.LifoQueue()
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.version = DatabaseVersion(db_path)
+        for _ in range(pool_size):
+            self._pool.put(None)  # connections are opened lazily
+
+    def _connect(self):
+        uri = "file:%s?mode=ro" % os.path.abspath(self.db_path)
+        conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_bytes)}")
+        conn.execute("PRAGMA query_only=ON")
+        conn.execute("PRAGMA cache_size=-65536")  # 64 MiB page cache
+        return conn
+
+    @contextmanager
+    def connection(self):
+        conn = self._pool.get()
+        try:
+            if conn is None:
+                conn = self._connect()
+            yield conn
+        except sqlite3.DatabaseError:
+            if conn is not None:
+                conn.close()
+            conn = None
+            raise
+        finally:
+            if self._closed and conn is not None:
+                conn.close()
+                conn = None
+            self._pool.put(conn)
+
+    def close(self):
+        """Close the pooled connections; later queries open and close their own.
+
+        Connections in use are closed when they are handed back, so a rerun
+        still holding a replaced engine can finish.
+        """
+        self._closed = True
+        drained = []
+        while True:
+            try:
+                drained.append(self._pool.get_nowait())
+            except queue.Empty:
+                break
+        for conn in drained:
+            if conn is not None:
+                conn.close()
+            self._pool.put(None)
+        self.version.close()
+        with self._lock:
+            self._cache.clear()
+
+    def explain(self, sql, params=()):
+        with self.connection() as conn:
+            rows = conn.execute("EXPLAIN QUERY PLAN " + sql.strip().rstrip(";"), params).fetchall()
+        return "\n".join(row[-1] for row in rows)
+
+    def query(self, sql, params=()):
+        """Run ``sql``; results are cached until the database changes."""
+        key = (sql, tuple(params), self.version())
+        with self._lock:
+            hit = self._cache.get(key)
+            if hit is not None:
+                self._cache.move_to_end(key)
+                return hit._replace(cached=True)
+        start = time.perf_counter()
+        with self.connection() as conn:
+            frame = pd.read_sql(sql, conn, params=params)
+        seconds = time.perf_counter() - start
+        result = QueryResult(frame, seconds, self.explain(sql, params), False)
+        with self._lock:
+            self._cache[key] = result
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return result
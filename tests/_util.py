@@ -0,0 +1,60 @@
+"""Reference results and comparisons shared by the tests."""
+import numpy as np
+import pandas as pd
+
+from data_store import RideStore, read_snapshot, write_snapshot
+from fused import EDA_AGGS, INSIGHTS_AGGS, result_column, sort_order
+
+ALL_AGGS = dict(EDA_AGGS, **INSIGHTS_AGGS)
+
+
+def make_store(df, path):
+    """A snapshot-backed store of ``df``, dictionary-encoded as the app loads it."""
+    path = str(path)
+    write_snapshot(df.sort_values("Date", kind="stable", ignore_index=True), path, {"kind": "test"})
+    return RideStore(read_snapshot(path, text=False))
+
+
+def pandas_agg(df, agg):
+    """The whole result of ``agg`` (``top`` ignored) as a Series by key, computed with plain pandas."""
+    if agg.where is not None:
+        column, op, label = agg.where
+        values = df[column].astype(object)
+        hit = values == label if op == "eq" else values.astype(str).str.contains(label, regex=False)
+        df = df[hit.to_numpy() & values.notna().to_numpy()]
+    keys = df[agg.by]
+    if pd.api.types.is_datetime64_any_dtype(keys):
+        keys = keys.dt.normalize()
+    groups = df.groupby(keys.astype(object) if isinstance(keys.dtype, pd.CategoricalDtype) else keys)
+    if agg.stat == "count":
+        return groups.size()
+    if agg.stat == "sum":
+        return groups[agg.value].sum()
+    return groups[agg.value].mean().dropna()
+
+
+def frame_series(frame, agg):
+    """A result frame as a Series by key."""
+    return pd.Series(frame[result_column(agg)].to_numpy(dtype=float), index=frame[agg.by].astype(object))
+
+
+def assert_same_agg(result, expected, agg):
+    """``result`` is ``agg`` over the data ``expected`` came from: same keys, values and order.
+
+    Keys tied on value may come in any order, and may be swapped at the
+    ``top`` cut-off.
+    """
+    got = frame_series(result, agg)
+    expected = expected.astype(float)
+    expected.index = expected.index.astype(object)
+    assert got.index.is_unique
+    if agg.top is not None:
+        assert len(got) == min(agg.top, len(expected))
+        assert np.allclose(got.to_numpy(), np.sort(expected.to_numpy())[::-1][:len(got)])
+    else:
+        assert set(got.index) == set(expected.index)
+    assert np.allclose(got.to_numpy(), expected.reindex(got.index).to_numpy())
+    if sort_order(agg) == "value":
+        assert (np.diff(got.to_numpy()) <= 1e-9).all()
+    else:
+        assert list(got.index) == sorted(got.index)
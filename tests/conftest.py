@@ -0,0 +1,26 @@
+import pandas as pd
+import pytest
+
+from benchmarks.synthetic import generate_rides
+from tests._util import make_store
+
+
+@pytest.fixture(scope="session")
+def rides():
+    """Ten weeks of synthetic rides, a few with no Booking_Value."""
+    df = generate_rides(20_000, start="2024-03-04", days=70, seed=7, n_customers=1_500)
+    df.loc[df.index[::89], "Booking_Value"] = float("nan")
+    return df
+
+
+@pytest.fixture(scope="session")
+def store(rides, tmp_path_factory):
+    return make_store(rides, tmp_path_factory.mktemp("store") / "rides.snapshot")
+
+
+@pytest.fixture(scope="session")
+def ranges(store):
+    """The full range, ranges starting and ending mid-week, a single day and one reaching before the data."""
+    first, last = store.min_date.normalize(), store.max_date.normalize()
+    day = lambda n: first + pd.Timedelta(days=n)
+    return [(first, last), (day(3), day(40)), (day(17), day(17)), (day(29), last), (day(-5), day(9))]
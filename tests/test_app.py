@@ -0,0 +1,24 @@
+import os
+
+import pytest
+
+from benchmarks.synthetic import write_rides
+
+AppTest = pytest.importorskip("streamlit.testing.v1").AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_home_page_with_precompute_pool(tmp_path, monkeypatch):
+    """The workers re-import app.py as their main module, which must not start the app again."""
+    write_rides(5_000, str(tmp_path / "rides_no_outliers.csv"), days=28)
+    os.symlink(os.path.join(ROOT, "images"), tmp_path / "images")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OLA_PRECOMPUTE_WORKERS", "2")
+    monkeypatch.setenv("OLA_REFRESH_SECONDS", "3600")
+
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=120)
+    at.run()
+    assert not at.exception
+    assert at.metric[0].label == "Total Rides"
+    assert at.metric[0].value == "5,000"
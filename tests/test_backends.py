@@ -0,0 +1,111 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from backends import PandasBackend, SQLiteBackend
+from bitmaps import BitmapIndex
+from ingest import insert_rows, open_db
+from kpis import KpiIndex
+from rollup import RollupCube
+from sketches import DistributionIndex, HISTOGRAMS
+from sql_engine import QueryEngine, prepare_database
+from topk import TopKIndex
+from tests._util import ALL_AGGS
+
+FILTERS = [
+    {},
+    {"Vehicle_Type": ["Auto", "Mini"], "Ride_Hour": [8, 9, 17, 18]},
+    {"Booking_Status": ["Success"], "Payment_Method": ["UPI", "Cash"]},
+]
+
+
+@pytest.fixture(scope="module")
+def pandas_backend(store):
+    return PandasBackend(store, KpiIndex(store), DistributionIndex(store), RollupCube(store),
+                         TopKIndex(store, ALL_AGGS), BitmapIndex(store))
+
+
+@pytest.fixture(scope="module")
+def sqlite_backend(rides, tmp_path_factory):
+    """The fixture rides written as ingest writes them."""
+    path = str(tmp_path_factory.mktemp("db") / "rides.db")
+    conn = open_db(path)
+    insert_rows(conn, rides.sort_values("Date", kind="stable", ignore_index=True), "rides", len(rides))
+    conn.close()
+    prepare_database(path)
+    return SQLiteBackend(QueryEngine(path))
+
+
+@pytest.fixture(params=range(len(FILTERS)), ids=["unfiltered", "vehicle_hour", "status_payment"])
+def backends(request, pandas_backend, sqlite_backend):
+    filters = FILTERS[request.param]
+    return pandas_backend.filtered(filters), sqlite_backend.filtered(filters), filters
+
+
+def rows_of(store, filters, start, end):
+    rows = store.filter_by_dates(start, end)
+    for column, values in filters.items():
+        rows = rows[rows[column].isin(values)]
+    return rows
+
+
+def test_date_bounds_and_options(pandas_backend, sqlite_backend):
+    assert [pd.Timestamp(d).normalize() for d in pandas_backend.date_bounds()] == \
+        [pd.Timestamp(d) for d in sqlite_backend.date_bounds()]
+    assert pandas_backend.filter_options() == sqlite_backend.filter_options()
+
+
+def test_aggregations_match(backends, ranges):
+    pandas, sqlite, _ = backends
+    for start, end in ranges:
+        expected = sqlite.run(ALL_AGGS, start, end)
+        for name, frame in pandas.run(ALL_AGGS, start, end).items():
+            pd.testing.assert_frame_equal(frame.reset_index(drop=True), expected[name], check_dtype=False,
+                                          check_categorical=False, obj=name)
+
+
+def test_kpis_match(backends, store, ranges):
+    pandas, sqlite, filters = backends
+    for start, end in ranges:
+        got, expected = pandas.kpi_summary(start, end), sqlite.kpi_summary(start, end)
+        assert got.keys() == expected.keys()
+        for name in got:
+            if name != "median_fare":
+                assert np.isclose(got[name], expected[name], equal_nan=True), name
+        rows = rows_of(store, filters, start, end)
+        fares = rows.loc[rows["Booking_Status"] == "Success", "Booking_Value"]
+        assert np.isclose(expected["median_fare"], fares.median(), equal_nan=True)
+
+
+def test_box_stats_exact_on_sqlite(backends, store, ranges):
+    _, sqlite, filters = backends
+    for start, end in ranges:
+        rows = rows_of(store, filters, start, end)
+        for name, q1, med, q3, lower, upper in sqlite.box_stats(start, end):
+            values = rows.loc[rows["Vehicle_Type"] == name, "Booking_Value"].dropna()
+            assert np.allclose([q1, med, q3], values.quantile([0.25, 0.5, 0.75]))
+            assert lower == values[values >= q1 - 1.5 * (q3 - q1)].min()
+            assert upper == values[values <= q3 + 1.5 * (q3 - q1)].max()
+
+
+def test_histograms_match(backends, ranges):
+    pandas, sqlite, _ = backends
+    for start, end in ranges:
+        for column in HISTOGRAMS:
+            edges, counts = pandas.histogram(column, start, end)
+            sql_edges, sql_counts = sqlite.histogram(column, start, end)
+            assert np.allclose(edges, sql_edges)
+            assert np.array_equal(counts, sql_counts), column
+
+
+@pytest.mark.parametrize("strategy", ["density", "sample"])
+def test_scatter_within_budget(backends, ranges, strategy):
+    pandas, sqlite, _ = backends
+    for start, end in ranges:
+        got = pandas.scatter("Ride_Distance", "Booking_Value", start, end, budget=500, strategy=strategy)
+        expected = sqlite.scatter("Ride_Distance", "Booking_Value", start, end, budget=500, strategy=strategy)
+        assert got.total == expected.total
+        if got.grid is not None:
+            assert got.grid.counts.sum() == expected.grid.counts.sum() == got.total
+        else:
+            assert len(got.points) == len(expected.points) == min(500, got.total)
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from bitmaps import BitmapIndex
+
+FILTERS = [
+    {},
+    {"Vehicle_Type": ["Auto", "Mini"]},
+    {"Booking_Status": ["Success"], "Payment_Method": ["UPI", "Cash"]},
+    {"Pickup_Location": ["Whitefield", "Hebbal", "MG Road"], "Ride_Hour": [8, 9, 17, 18]},
+    {"Vehicle_Type": ["Bike"], "Booking_Status": ["Canceled by Driver"], "Ride_Hour": [23]},
+    {"Vehicle_Type": ["No Such Vehicle"]},
+]
+
+
+def mask_select(store, filters, start, end):
+    """The chained boolean masks the bitmaps replace."""
+    days = store.df["Date"].dt.normalize()
+    mask = days.between(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize())
+    for column, values in filters.items():
+        mask &= store.df[column].isin(values)
+    return np.flatnonzero(mask.to_numpy())
+
+
+@pytest.fixture(scope="module")
+def index(store):
+    return BitmapIndex(store)
+
+
+@pytest.mark.parametrize("filters", FILTERS)
+def test_select_matches_masks(store, index, ranges, filters):
+    for start, end in ranges:
+        assert np.array_equal(index.select(filters, start, end), mask_select(store, filters, start, end))
+
+
+def test_options_are_the_values_present(store, index):
+    for column, values in index.options().items():
+        assert values == sorted(store.df[column].dropna().unique().tolist())
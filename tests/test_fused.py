@@ -0,0 +1,27 @@
+import pytest
+
+from data_store import RideStore
+from fused import run
+from tests._util import ALL_AGGS, assert_same_agg, pandas_agg
+
+
+@pytest.mark.parametrize("name", list(ALL_AGGS))
+def test_run_matches_pandas(store, ranges, name):
+    agg = ALL_AGGS[name]
+    for start, end in ranges:
+        df = store.filter_by_dates(start, end)
+        assert_same_agg(run(df, {name: agg})[name], pandas_agg(df, agg), agg)
+
+
+def test_object_columns_match_pandas(rides):
+    # The CSV path leaves strings as objects rather than dictionary codes.
+    df = RideStore(rides.copy()).df
+    out = run(df, ALL_AGGS)
+    for name, agg in ALL_AGGS.items():
+        assert_same_agg(out[name], pandas_agg(df, agg), agg)
+
+
+def test_fused_pass_matches_separate_runs(store):
+    together = run(store.df, ALL_AGGS)
+    for name, agg in ALL_AGGS.items():
+        assert together[name].equals(run(store.df, {name: agg})[name])
@@ -0,0 +1,75 @@
+import os
+import shutil
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import ingest
+from benchmarks.synthetic import write_rides
+from data_store import read_snapshot
+
+
+def contents(db_path, snapshot_dir):
+    with sqlite3.connect(db_path) as conn:
+        db = pd.read_sql('SELECT * FROM rides ORDER BY "Booking_ID"', conn)
+    snapshot = read_snapshot(snapshot_dir, mmap=False)
+    return db, snapshot
+
+
+@pytest.fixture(scope="module")
+def csv_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("csv") / "rides.csv"
+    write_rides(10_000, path, days=20, seed=3)
+    return str(path)
+
+
+@pytest.fixture(scope="module")
+def clean(csv_path, tmp_path_factory):
+    out = tmp_path_factory.mktemp("clean")
+    ingest.ingest(csv_path, str(out / "rides.db"), str(out / "rides.snapshot"), chunksize=2000, log=lambda m: None)
+    return contents(out / "rides.db", str(out / "rides.snapshot"))
+
+
+@pytest.mark.parametrize("step", ["insert_rows", "append_snapshot"])
+def test_resume_after_interrupt(csv_path, clean, tmp_path, monkeypatch, step):
+    db_path, snapshot_dir = str(tmp_path / "rides.db"), str(tmp_path / "rides.snapshot")
+    original, calls = getattr(ingest, step), []
+
+    def interrupted(*args, **kwargs):
+        calls.append(None)
+        if len(calls) == 3:
+            raise KeyboardInterrupt
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(ingest, step, interrupted)
+    with pytest.raises(KeyboardInterrupt):
+        ingest.ingest(csv_path, db_path, snapshot_dir, chunksize=2000, log=lambda m: None)
+    monkeypatch.undo()
+    ingest.ingest(csv_path, db_path, snapshot_dir, chunksize=2000, log=lambda m: None)
+
+    db, snapshot = contents(db_path, snapshot_dir)
+    pd.testing.assert_frame_equal(db, clean[0])
+    pd.testing.assert_frame_equal(snapshot, clean[1])
+    assert len(db) == len(snapshot) > 0
+
+
+def test_rerun_adds_nothing(csv_path, tmp_path):
+    db_path, snapshot_dir = str(tmp_path / "rides.db"), str(tmp_path / "rides.snapshot")
+    assert ingest.ingest(csv_path, db_path, snapshot_dir, chunksize=2000, log=lambda m: None) > 0
+    assert ingest.ingest(csv_path, db_path, snapshot_dir, chunksize=2000, log=lambda m: None) == 0
+
+
+@pytest.mark.parametrize("lost", [None, "db", "snapshot"])
+def test_restart_rebuilds_what_was_lost(csv_path, clean, tmp_path, lost):
+    db_path, snapshot_dir = str(tmp_path / "rides.db"), str(tmp_path / "rides.snapshot")
+    ingest.ingest(csv_path, db_path, snapshot_dir, chunksize=2000, log=lambda m: None)
+    if lost == "db":
+        os.remove(db_path)
+    elif lost == "snapshot":
+        shutil.rmtree(snapshot_dir)
+    ingest.ingest(csv_path, db_path, snapshot_dir, chunksize=2000, restart=True, log=lambda m: None)
+
+    db, snapshot = contents(db_path, snapshot_dir)
+    pd.testing.assert_frame_equal(db, clean[0])
+    pd.testing.assert_frame_equal(snapshot, clean[1])
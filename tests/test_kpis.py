@@ -0,0 +1,26 @@
+import numpy as np
+
+from kpis import KpiIndex
+
+
+def pandas_summary(df):
+    success = df[df["Booking_Status"] == "Success"]
+    return {
+        "total_rides": len(df),
+        "successful_rides": len(success),
+        "success_rate": (df["Booking_Status"] == "Success").mean() * 100,
+        "cancel_rate": df["Booking_Status"].astype(str).str.contains("Canceled").mean() * 100,
+        "total_cancellations": int((df["Booking_Status"] != "Success").sum()),
+        "avg_fare": success["Booking_Value"].mean(),
+        "avg_distance": success["Ride_Distance"].mean(),
+        "avg_driver_rating": df["Driver_Ratings"].mean(),
+        "avg_customer_rating": df["Customer_Rating"].mean(),
+    }
+
+
+def test_summary_matches_pandas(store, ranges):
+    index = KpiIndex(store)
+    for start, end in ranges:
+        got = index.summary(start, end)
+        for name, expected in pandas_summary(store.filter_by_dates(start, end)).items():
+            assert np.isclose(got[name], expected), (name, start, end)
@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+
+from plots import _grid_bins, _xy, scatter_data, stratified_sample
+
+
+@pytest.mark.parametrize("budget", [1, 37, 500, 4_000])
+def test_stratified_sample_within_budget(rides, budget):
+    xs, ys, ok = _xy(rides, "Ride_Distance", "Booking_Value")
+    sample = stratified_sample(rides, "Ride_Distance", "Booking_Value", budget)
+    assert len(sample) == min(budget, ok.sum())
+    assert sample.index.is_unique and sample.index.isin(rides.index[ok]).all()
+
+
+def test_stratified_sample_keeps_sparse_cells(rides):
+    xs, ys, ok = _xy(rides, "Ride_Distance", "Booking_Value")
+    cells = _grid_bins(xs, ys, 50)
+    sample = stratified_sample(rides, "Ride_Distance", "Booking_Value", 2_000)
+    kept = cells[np.searchsorted(np.flatnonzero(ok), rides.index.get_indexer(sample.index))]
+    # The budget covers every occupied cell, so each keeps a row.
+    assert len(np.unique(cells)) <= 2_000
+    assert set(kept) == set(cells)
+
+
+def test_scatter_data_switches_to_density_above_budget(rides):
+    plotted = rides["Booking_Value"].notna() & rides["Ride_Distance"].notna()
+    small = scatter_data(rides.iloc[:100], "Ride_Distance", "Booking_Value", budget=100)
+    assert small.grid is None and len(small.points) == small.total == plotted.iloc[:100].sum()
+    dense = scatter_data(rides, "Ride_Distance", "Booking_Value", budget=100)
+    assert dense.points is None and dense.total == dense.grid.counts.sum() == plotted.sum()
+    sampled = scatter_data(rides, "Ride_Distance", "Booking_Value", budget=100, strategy="sample")
+    assert len(sampled.points) == 100
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from kpis import KpiIndex
+from precompute import Precompute
+from rollup import RollupCube, cube_supports, run_agg
+from sketches import DistributionIndex
+from topk import TopKIndex
+from tests._util import ALL_AGGS, make_store
+
+
+def assert_matches_direct(indexes, store, ranges):
+    """The merged partials give the same indexes as building them from the whole store."""
+    kpis = KpiIndex(store)
+    for name, cum in kpis.cum.items():
+        assert np.allclose(indexes.kpis.cum[name], cum), name
+
+    dists = DistributionIndex(store, indexes.dists.layout)
+    assert np.array_equal(indexes.dists.value_cum, dists.value_cum)
+    for column, cum in dists.hist_cum.items():
+        assert np.array_equal(indexes.dists.hist_cum[column], cum), column
+
+    cube, topk = RollupCube(store), TopKIndex(store, ALL_AGGS)
+    for start, end in ranges:
+        for name, agg in ALL_AGGS.items():
+            if name in topk.aggs:
+                pd.testing.assert_frame_equal(indexes.topk.query(name, start, end), topk.query(name, start, end))
+        merged, direct = indexes.cube.slice(start, end), cube.slice(start, end)
+        for agg in filter(cube_supports, ALL_AGGS.values()):
+            pd.testing.assert_frame_equal(run_agg(merged, agg), run_agg(direct, agg), check_dtype=False)
+
+
+def test_merge_matches_direct(store, ranges):
+    assert_matches_direct(Precompute(ALL_AGGS, workers=1).run(store), store, ranges)
+
+
+def test_new_day_recomputes_its_week(rides, ranges, tmp_path):
+    last_day = rides["Date"].dt.normalize().max()
+    before = make_store(rides[rides["Date"] < last_day], tmp_path / "before.snapshot")
+    after = make_store(rides, tmp_path / "after.snapshot")
+    precompute = Precompute(ALL_AGGS, workers=1)
+    precompute.run(before)
+    indexes = precompute.run(after)
+    assert precompute.stats["recomputed"] == 1
+    assert_matches_direct(indexes, after, ranges)
+
+
+@pytest.mark.parametrize("workers", [2])
+def test_pool_matches_direct(rides, ranges, tmp_path, workers):
+    path = str(tmp_path / "rides.snapshot")
+    store = make_store(rides, path)
+    precompute = Precompute(ALL_AGGS, workers=workers)
+    indexes = precompute.run(store, snapshot_dir=path)
+    assert precompute.stats["recomputed"] == precompute.stats["partitions"] > 1
+    assert_matches_direct(indexes, store, ranges)
+
+
+def test_relabel_recomputes(rides, ranges, tmp_path):
+    precompute = Precompute(ALL_AGGS, workers=1)
+    precompute.run(make_store(rides, tmp_path / "before.snapshot"))
+    renamed = rides.assign(Booking_Status=rides["Booking_Status"].replace("Success", "Successful"))
+    after = make_store(renamed, tmp_path / "after.snapshot")
+    indexes = precompute.run(after)
+    assert precompute.stats["recomputed"] == precompute.stats["partitions"]
+    assert indexes.kpis.summary(after.min_date, after.max_date)["successful_rides"] == 0
+    assert_matches_direct(indexes, after, ranges)
+
+
+def test_new_label_recomputes_its_week(rides, ranges, tmp_path):
+    """A new label on the first day shifts the codes of every label seen after it; one week's rows changed."""
+    precompute = Precompute(ALL_AGGS, workers=1)
+    precompute.run(make_store(rides, tmp_path / "before.snapshot"))
+    changed = rides.copy()
+    changed.loc[changed["Date"].idxmin(), "Customer_ID"] = "CID-new"
+    after = make_store(changed, tmp_path / "after.snapshot")
+    indexes = precompute.run(after)
+    assert precompute.stats["recomputed"] == 1
+    assert_matches_direct(indexes, after, ranges)
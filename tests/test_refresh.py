@@ -0,0 +1,86 @@
+import pytest
+
+from refresh import DataRefresher
+
+
+class Source:
+    """A version to poll and a build that records its calls."""
+
+    def __init__(self):
+        self.version = 1
+        self.builds = []
+        self.retired = []
+        self.fail = False
+
+    def build(self, version, previous):
+        if self.fail:
+            raise RuntimeError("bad data")
+        self.builds.append((version, previous.value if previous else None))
+        return "value %d" % version
+
+
+@pytest.fixture
+def source():
+    return Source()
+
+
+@pytest.fixture
+def refresher(source):
+    refresher = DataRefresher(source.build, lambda: source.version, interval=3600,
+                              retire=lambda old, new: source.retired.append((old, new)))
+    yield refresher
+    refresher.stop()
+
+
+def test_first_load(source, refresher):
+    generation = refresher.current()
+    assert (generation.number, generation.version, generation.value) == (1, 1, "value 1")
+    assert source.builds == [(1, None)]
+    assert not refresher.check()
+
+
+def test_swaps_once_the_version_settles(source, refresher):
+    held = refresher.current()
+    source.version = 2
+    assert not refresher.check()  # pending until seen twice
+    assert refresher.check()
+    assert refresher.current().number == 2 and refresher.current().value == "value 2"
+    assert source.builds[-1] == (2, "value 1")
+    assert source.retired == [("value 1", "value 2")]
+    # A rerun that took the old generation keeps it.
+    assert held.value == "value 1"
+
+
+def test_changing_version_is_not_built(source, refresher):
+    for version in (2, 3, 4):
+        source.version = version
+        assert not refresher.check()
+    source.version = 1  # back where it was: nothing pending
+    assert not refresher.check()
+    source.version = 5
+    assert not refresher.check()
+    assert len(source.builds) == 1
+
+
+def test_failed_build_keeps_serving(source, refresher):
+    source.version, source.fail = 2, True
+    refresher.check()
+    assert not refresher.check()
+    assert isinstance(refresher.error, RuntimeError)
+    assert refresher.current().value == "value 1" and not source.retired
+    source.fail = False
+    assert refresher.check()
+    assert refresher.error is None and refresher.current().value == "value 2"
+
+
+def test_version_read_after_build(source):
+    def build(version, previous):
+        source.version = version + 10  # e.g. the build indexed the database
+        return version
+
+    refresher = DataRefresher(build, lambda: source.version, interval=3600)
+    try:
+        assert refresher.current().version == 11
+        assert not refresher.check()
+    finally:
+        refresher.stop()
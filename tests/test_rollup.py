@@ -0,0 +1,22 @@
+import pytest
+
+from fused import run
+from rollup import RollupCube, cube_supports, run_agg
+from tests._util import ALL_AGGS, assert_same_agg, frame_series
+
+CUBE_AGGS = {name: agg for name, agg in ALL_AGGS.items() if cube_supports(agg)}
+
+
+@pytest.fixture(scope="module")
+def cube(store):
+    return RollupCube(store)
+
+
+@pytest.mark.parametrize("name", list(CUBE_AGGS))
+def test_cube_matches_fused(store, cube, ranges, name):
+    agg = CUBE_AGGS[name]
+    for start, end in ranges:
+        # The engine's whole result, so ties at a top-k cut-off cannot differ.
+        full = agg._replace(top=None)
+        expected = frame_series(run(store.filter_by_dates(start, end), {name: full})[name], full)
+        assert_same_agg(run_agg(cube.slice(start, end), agg), expected, agg)
@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+from sketches import RELATIVE_ERROR, DistributionIndex
+
+
+@pytest.fixture(scope="module")
+def dists(store):
+    return DistributionIndex(store)
+
+
+def sample_quantile(values, q):
+    """The sample the sketch's rank rule reads: rank ``floor(q * (n - 1))``."""
+    values = np.sort(values[~np.isnan(values)])
+    return values[int(q * (len(values) - 1))]
+
+
+def assert_within_error(estimate, exact):
+    assert abs(estimate - exact) <= RELATIVE_ERROR * exact * (1 + 1e-9)
+
+
+def test_median_fare_within_relative_error(store, dists, ranges):
+    for start, end in ranges:
+        rows = store.filter_by_dates(start, end)
+        fares = rows.loc[rows["Booking_Status"] == "Success", "Booking_Value"].to_numpy(dtype=float)
+        assert_within_error(dists.median_fare(start, end), sample_quantile(fares, 0.5))
+        # Rows selected by the sidebar filters go through the same layout.
+        assert dists.median_fare(None, None, rows=rows) == dists.median_fare(start, end)
+
+
+def test_box_stats_within_relative_error(store, dists, ranges):
+    for start, end in ranges:
+        rows = store.filter_by_dates(start, end)
+        stats = dists.box_stats(start, end)
+        assert [row[0] for row in stats] == sorted(rows["Vehicle_Type"].astype(str).unique())
+        for name, q1, med, q3, lower, upper in stats:
+            values = rows.loc[rows["Vehicle_Type"] == name, "Booking_Value"].to_numpy(dtype=float)
+            for q, estimate in zip([0.25, 0.5, 0.75], [q1, med, q3]):
+                assert_within_error(estimate, sample_quantile(values, q))
+            assert lower <= q1 <= med <= q3 <= upper
+
+
+def test_histograms_match_numpy(store, dists, ranges):
+    for start, end in ranges:
+        rows = store.filter_by_dates(start, end)
+        for column in dists.hist_edges:
+            edges, counts = dists.histogram(column, start, end)
+            values = rows[column].to_numpy(dtype=float)
+            assert np.array_equal(counts, np.histogram(values[~np.isnan(values)], bins=edges)[0])
@@ -0,0 +1,91 @@
+import os
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from sql_engine import DatabaseVersion, QueryEngine, prepare_database
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "rides.db")
+    with sqlite3.connect(path) as conn:
+        conn.execute('CREATE TABLE rides ("Booking_ID" TEXT, "Date" TEXT, "Booking_Status" TEXT)')
+        conn.executemany("INSERT INTO rides VALUES (?, ?, ?)",
+                         [("CNR1", "2024-07-01", "Success"), ("CNR2", "2024-07-02", "Canceled by Driver")])
+    conn.close()
+    return path
+
+
+def test_missing_database_is_not_created(tmp_path):
+    path = str(tmp_path / "missing.db")
+    assert prepare_database(path) is False
+    engine = QueryEngine(path)
+    with pytest.raises(sqlite3.OperationalError):
+        engine.query("SELECT 1")
+    assert not os.path.exists(path)
+    # The pool is intact once the database shows up.
+    with sqlite3.connect(path) as conn:
+        conn.execute("CREATE TABLE t (x)")
+    conn.close()
+    assert engine.query("SELECT 1 AS one").frame["one"].tolist() == [1]
+
+
+def test_prepare_database_indexes_existing_columns(db_path):
+    assert prepare_database(db_path) is True
+    with sqlite3.connect(db_path) as conn:
+        indexes = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+    assert indexes == {"idx_rides_Date", "idx_rides_Booking_Status"}
+
+
+def test_cache_follows_commits(db_path):
+    prepare_database(db_path)
+    engine = QueryEngine(db_path)
+    sql = "SELECT COUNT(*) AS n FROM rides"
+    first = engine.query(sql)
+    assert engine.query(sql).cached and first.frame["n"][0] == 2
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO rides VALUES ('CNR3', '2024-07-03', 'Success')")
+    conn.close()
+    again = engine.query(sql)
+    assert not again.cached and again.frame["n"][0] == 3
+    with pytest.raises(pd.errors.DatabaseError, match="readonly"):
+        engine.query("INSERT INTO rides VALUES ('CNR4', '2024-07-04', 'Success')")
+
+
+def test_closed_engine_still_answers(db_path):
+    engine = QueryEngine(db_path, pool_size=1)
+    engine.query("SELECT 1")
+    engine.close()
+    assert engine.query("SELECT COUNT(*) AS n FROM rides").frame["n"][0] == 2
+    assert engine._pool.get_nowait() is None
+
+
+def test_database_version_follows_commits_not_readers(db_path):
+    prepare_database(db_path)
+    version = DatabaseVersion(db_path)
+    first = version()
+    QueryEngine(db_path).query("SELECT COUNT(*) FROM rides")  # creates -wal / -shm readers
+    assert version() == first
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("INSERT INTO rides VALUES ('CNR3', '2024-07-03', 'Success')")
+    conn.close()
+    assert version() != first
+    version.close()
+
+
+def test_database_version_sees_replaced_and_missing_files(db_path, tmp_path):
+    version = DatabaseVersion(db_path)
+    first = version()
+    other = str(tmp_path / "other.db")
+    with sqlite3.connect(other) as conn:
+        conn.execute("CREATE TABLE rides (x)")
+    conn.close()
+    os.replace(other, db_path)
+    assert version() not in (None, first)
+    os.remove(db_path)
+    assert version() is None
+    version.close()
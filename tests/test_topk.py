@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from topk import TopKIndex, _spans, supports
+from tests._util import ALL_AGGS, assert_same_agg, frame_series, pandas_agg
+
+TOPK_AGGS = {name: agg for name, agg in ALL_AGGS.items() if supports(agg)}
+
+
+@pytest.fixture(scope="module")
+def small(store):
+    """Summaries just above ``top``, small enough that most spans drop keys."""
+    return TopKIndex(store, TOPK_AGGS, capacity=12)
+
+
+@pytest.mark.parametrize("n_days", [1, 2, 5, 7, 8, 70])
+def test_spans_cover_the_range_once(n_days):
+    for lo in range(n_days):
+        for hi in range(lo + 1, n_days + 1):
+            days = [d for level, node in _spans(lo, hi, n_days)
+                    for d in range(node << level, min((node + 1) << level, n_days))]
+            assert days == list(range(lo, hi))
+    # The full range is the root, even when its last node is partial.
+    assert len(_spans(0, n_days, n_days)) == 1
+
+
+@pytest.mark.parametrize("name", list(TOPK_AGGS))
+def test_values_within_error_bound(store, small, ranges, name):
+    agg = TOPK_AGGS[name]
+    rng = np.random.default_rng(0)
+    days = pd.date_range(store.min_date.normalize(), store.max_date.normalize())
+    random_ranges = [tuple(days[np.sort(rng.integers(0, len(days), 2))]) for _ in range(20)]
+    for start, end in ranges + random_ranges:
+        out = small.query(name, start, end)
+        exact = pandas_agg(store.filter_by_dates(start, end), agg)
+        got = frame_series(out, agg)
+        truth = exact.reindex(got.index).fillna(0).to_numpy(dtype=float)
+        bound = out.attrs["error_bound"]
+        # Lower bounds, short by at most the reported bound.
+        assert (truth >= got.to_numpy() - 1e-6).all()
+        assert (truth - got.to_numpy() <= bound + 1e-6).all()
+        # The keys counted as certain lead the list and are in the exact top k.
+        kth = np.sort(exact.to_numpy(dtype=float))[::-1][:agg.top][-1] if len(exact) else 0.0
+        assert (truth[:out.attrs["certain"]] >= kth - 1e-6).all()
+        if bound == 0 and out.attrs["certain"] == len(out):
+            assert_same_agg(out, exact, agg)
+
+
+@pytest.mark.parametrize("name", list(TOPK_AGGS))
+def test_exact_when_no_key_is_dropped(store, ranges, name):
+    """Summaries with room for every key are exact on every range."""
+    agg = TOPK_AGGS[name]
+    index = TopKIndex(store, {name: agg}, capacity=store.df[agg.by].nunique())
+    for start, end in ranges:
+        out = index.query(name, start, end)
+        assert out.attrs["error_bound"] == 0
+        assert_same_agg(out, pandas_agg(store.filter_by_dates(start, end), agg), agg)
@@ -0,0 +1,185 @@
+"""Mergeable heavy-hitter summaries for the top-k leaderboards.
+
+For every leaderboard :class:`fused.Agg` (a count or sum with ``top``), each
+day keeps only its ``capacity`` heaviest keys plus a *threshold*: the
+largest weight of any key it dropped.  Like Space-Saving counters these
+summaries merge by addition, with bounded memory whatever the key
+cardinality:
+
+* the days are covered by a dyadic tree of spans (1, 2, 4, ... days), each
+  span the merge of its two halves truncated back to ``capacity`` keys;
+* a date range is covered by O(log days) spans, whose merged weight for a
+  key is a lower bound on its true total;
+* it is short by at most the thresholds of the spans below that dropped
+  it, which is the error bound reported with the result.
+
+The day summaries are all that depends on the rows, so :mod:`precompute`
+builds them per partition and only the spans above the days are merged
+again after new data.  The bounds are tight for keys that lead on the
+days they appear, like locations; keys like Customer_ID, whose weight is
+spread thinly over many days, get wide bounds over long ranges.  Small
+date ranges skip the summaries and count exactly.
+"""
+import numpy as np
+import pandas as pd
+
+from fused import _by_value, _codes, _values, _where_slots, result_column, sort_order
+from kpis import row_days
+
+# Keys kept per span and leaderboard.
+TOPK_CAPACITY = 500
+# Ranges with at most this many rows are counted exactly.
+EXACT_ROWS = 250_000
+
+
+def supports(agg):
+    return agg.top is not None and agg.stat in ("count", "sum")
+
+
+def _spans(lo, hi, n_days):
+    """Cover days ``lo:hi`` of ``0:n_days`` with aligned power-of-two spans as ``(level, node)``.
+
+    The last node of a level ends at ``n_days``, so a range reaching the
+    last day can use it even though it is partial.
+    """
+    out = []
+    while lo < hi:
+        level = 0
+        while (1 << level) < n_days and lo % (2 << level) == 0 and min(lo + (2 << level), n_days) <= hi:
+            level += 1
+        out.append((level, lo >> level))
+        lo = min(lo + (1 << level), n_days)
+    return out
+
+
+def day_totals(df, days, aggs, codes_cache=None):
+    """``{name: (day, key, total, labels)}``: exact totals per day position and label slot."""
+    codes_cache = {} if codes_cache is None else codes_cache
+    value_cache, out = {}, {}
+    for name, agg in aggs.items():
+        codes, labels = _codes(df, agg.by, codes_cache)
+        keep = codes > 0
+        if agg.where is not None:
+            w_codes, w_labels = _codes(df, agg.where[0], codes_cache)
+            keep &= _where_slots(agg.where, w_labels)[w_codes]
+        weights = None if agg.stat == "count" else _values(df, agg.value, value_cache)[0][keep]
+        day_key, totals = _group(days[keep].astype(np.int64) * len(labels) + codes[keep] - 1, weights)
+        out[name] = (day_key // len(labels), day_key % len(labels), totals, labels)
+    return out
+
+
+def day_summaries(df, days, n_days, aggs, capacity=TOPK_CAPACITY):
+    """``{name: (day, labels, weights, thresholds)}``: each day's ``capacity`` heaviest keys.
+
+    ``days`` is each row's day position; ``thresholds`` has one entry per day.
+    """
+    out = {}
+    for name, (day, key, totals, labels) in day_totals(df, days, aggs).items():
+        keys, weights, _, offsets, thresholds = _truncate(day, key, totals, np.zeros(len(totals)),
+                                                          np.zeros(n_days), capacity)
+        out[name] = (np.repeat(np.arange(n_days), np.diff(offsets)), np.asarray(labels[keys]), weights, thresholds)
+    return out
+
+
+def _truncate(node, key, weights, errors, floor, capacity):
+    """Keep each node's ``capacity`` heaviest keys.
+
+    Returns flat ``(keys, weights, errors, offsets, thresholds)`` with node
+    ``j`` at ``offsets[j]:offsets[j + 1]``.  A node's threshold bounds the
+    weight of any key it does not keep: the largest upper bound it dropped,
+    and at least ``floor``, the bound for keys it never saw.
+    """
+    n_nodes = len(floor)
+    order = np.lexsort((-weights, node))
+    node, key, weights, errors = node[order], key[order], weights[order], errors[order]
+    per_node = np.bincount(node, minlength=n_nodes)
+    starts = np.concatenate([[0], np.cumsum(per_node)[:-1]])
+    kept = np.arange(len(order)) - starts[node] < capacity
+    thresholds = floor.astype(float)
+    np.maximum.at(thresholds, node[~kept], (weights + errors)[~kept])
+    offsets = np.concatenate([[0], np.cumsum(np.minimum(per_node, capacity))])
+    return key[kept], weights[kept], errors[kept], offsets, thresholds
+
+
+class TopKIndex:
+    """Top-``capacity`` summaries for the leaderboard aggregations in ``aggs``.
+
+    ``days`` (see :func:`day_summaries`) may be passed in when it was
+    computed elsewhere, e.g. partition by partition in :mod:`precompute`.
+    """
+
+    def __init__(self, store, aggs, capacity=TOPK_CAPACITY, days=None):
+        self.store = store
+        self.capacity = capacity
+        self.aggs = {name: agg for name, agg in aggs.items() if supports(agg)}
+        if days is None:
+            days = day_summaries(store.df, row_days(store), store.n_days, self.aggs, capacity)
+        self.levels = {name: self._build(*days[name]) for name in self.aggs}
+
+    def _build(self, day, labels, weights, thresholds):
+        """Every level of the tree, from the day summaries up to the root."""
+        slots, labels = pd.factorize(labels, sort=True)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(day, minlength=len(thresholds)))])
+        level = (slots, weights, np.zeros(len(weights)), offsets, thresholds)
+        levels = [level]
+        while len(level[4]) > 1:
+            keys, weights, errors, offsets, thresholds = level
+            node = np.repeat(np.arange(len(thresholds)), np.diff(offsets))
+            # A parent may be short, for each key, by the threshold of every
+            # half that dropped it and by the error of every half that kept it.
+            floor = np.bincount(np.arange(len(thresholds)) >> 1, weights=thresholds)
+            parent_key, parent_weights = _group((node >> 1) * len(labels) + keys, weights)
+            _, adjust = _group((node >> 1) * len(labels) + keys, errors - thresholds[node])
+            parent = parent_key // len(labels)
+            level = _truncate(parent, parent_key % len(labels), parent_weights, floor[parent] + adjust,
+                              floor, self.capacity)
+            levels.append(level)
+        return levels, labels
+
+    def exact(self, start, end):
+        """Whether the range is small enough to count exactly."""
+        lo, hi = self.store.row_range(start, end)
+        return hi - lo <= EXACT_ROWS
+
+    def query(self, name, start, end):
+        """Leaderboard for ``name`` by merged lower bounds.
+
+        ``attrs["error_bound"]`` bounds the undercount of each value.  The
+        undercounts also make the membership and order approximate:
+        ``attrs["certain"]`` counts the keys shown that are sure to be in
+        the exact top ``agg.top``, their lower bound being at least the upper
+        bound of every key left out.
+        """
+        agg = self.aggs[name]
+        levels, labels = self.levels[name]
+        parts = []
+        for level, node in _spans(*self.store.day_index(start, end), self.store.n_days):
+            keys, weights, errors, offsets, thresholds = levels[level]
+            span = slice(offsets[node], offsets[node + 1])
+            parts.append((keys[span], weights[span], thresholds[node] - errors[span], thresholds[node]))
+        keys, weights, covered = (np.concatenate([p[i] for p in parts]) if parts else np.zeros(0) for i in range(3))
+        uniq, inverse = np.unique(keys.astype(np.intp), return_inverse=True)
+        lower = np.bincount(inverse, weights=weights, minlength=len(uniq))
+        # A span that kept the key is short by its error for the key rather
+        # than by its threshold.
+        unseen = sum(p[3] for p in parts)
+        slack = unseen - np.bincount(inverse, weights=covered, minlength=len(uniq))
+
+        idx = _by_value(lower, labels[uniq], agg.top)
+        # A key no span kept may still weigh up to ``unseen``.
+        left_out = np.ones(len(uniq), dtype=bool)
+        left_out[idx] = False
+        ceiling = max((lower + slack)[left_out].max(initial=0.0), unseen)
+        if sort_order(agg) == "key":
+            idx = idx[np.argsort(uniq[idx])]
+        values = np.rint(lower[idx]).astype(np.int64) if agg.stat == "count" else lower[idx]
+        out = pd.DataFrame({agg.by: labels[uniq[idx]], result_column(agg): values})
+        out.attrs["error_bound"] = float(slack[idx].max()) if len(idx) else 0.0
+        out.attrs["certain"] = int((lower[idx] >= ceiling).sum())
+        return out
+
+
+def _group(keys, weights=None):
+    """Distinct ``keys`` and the summed ``weights`` per key."""
+    uniq, inverse = np.unique(keys, return_inverse=True)
+    return uniq, np.bincount(inverse, weights=weights, minlength=len(uniq)).astype(float)